@@ -1,5 +1,14 @@
+import os
+import sys
+
+import numpy as np
 import pygame
-import random
+
+import bitboard
+import engine
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import assets
 
 pygame.init()
 
@@ -7,6 +16,11 @@ pygame.init()
 SIZE = 8
 CELL = 64
 WIDTH = HEIGHT = SIZE * CELL
+# the candies load in the background while the window opens; 4px padding
+# on every side keeps each candy inside its own cell
+pending = assets.preload({
+    i: (f"assets/bon bon {i + 1}.png", [("smoothscale", (CELL - 8, CELL - 8))]) for i in range(4)
+})
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Simple Candy Crush")
 
@@ -14,76 +28,56 @@ clock = pygame.time.Clock()
 FPS = 30
 BG_COLOR = (200, 200, 200)
 GRID_COLOR = (0, 0, 0)
+HINT_COLOR = (255, 215, 0)
+# board backend: the NumPy engine, or per-colour bitmasks with --bitboard
+# (python bench.py compares them per board size)
+backend = bitboard if "--bitboard" in sys.argv else engine
 
 # ---------------- IMAGES ----------------
-images = []
-for i in range(1, 5):
-    img = pygame.image.load(f"assets/bon bon {i}.png")
-    images.append(pygame.transform.scale(img, (CELL, CELL)))
+loaded = assets.finish(pending)
+images = [loaded[i] for i in range(4)]
+
+# 🔲 KUTUCUK (GRID), baked once
+background = pygame.Surface((WIDTH, HEIGHT)).convert()
+background.fill(BG_COLOR)
+for r in range(SIZE):
+    for c in range(SIZE):
+        pygame.draw.rect(background, GRID_COLOR, (c * CELL, r * CELL, CELL, CELL), 1)
 
 # ---------------- BOARD ----------------
-board = [[random.randint(0, 3) for _ in range(SIZE)] for _ in range(SIZE)]
+game = backend.new_game(SIZE)
 selected = None
-score = 0
+hint = None
+# what is currently on screen, so draw() only touches cells that changed
+shown = np.full((SIZE, SIZE), -1, dtype=np.int8)
+shown_hint = None
 
 # ---------------- FUNCTIONS ----------------
 def draw():
-    screen.fill(BG_COLOR)
-
-    for r in range(SIZE):
-        for c in range(SIZE):
-            x = c * CELL
-            y = r * CELL
-
-            # 🔲 KUTUCUK (GRID)
-            pygame.draw.rect(
-                screen,
-                GRID_COLOR,
-                (x, y, CELL, CELL),
-                1
-            )
-
-            # 🍬 BONBON
-            screen.blit(
-                images[board[r][c]],
-                (x + 4, y + 4)
-            )
-
-def new_game():
-    global board
-    board = [[random.randint(0, 3) for _ in range(SIZE)] for _ in range(SIZE)]
-
-def swap(a, b):
-    board[a[0]][a[1]], board[b[0]][b[1]] = board[b[0]][b[1]], board[a[0]][a[1]]
-
-def find_matches():
-    matches = set()
-
-    for r in range(SIZE):
-        for c in range(SIZE - 2):
-            if board[r][c] == board[r][c+1] == board[r][c+2]:
-                matches.update({(r,c), (r,c+1), (r,c+2)})
-
-    for c in range(SIZE):
-        for r in range(SIZE - 2):
-            if board[r][c] == board[r+1][c] == board[r+2][c]:
-                matches.update({(r,c), (r+1,c), (r+2,c)})
-
-    return matches
-
-def remove(matches):
-    global score
-    for r,c in matches:
-        board[r][c] = -1
-    score += len(matches)
-
-def drop():
-    for c in range(SIZE):
-        col = [board[r][c] for r in range(SIZE) if board[r][c] != -1]
-        while len(col) < SIZE:
-            col.insert(0, random.randint(0, 3))
-        for r in range(SIZE):
-            board[r][c] = col[r]
+    # redraws only the changed cells and returns their rects for display.update
+    global shown_hint
+    board = game["board"]
+    cells = {(r, c) for r, c in np.argwhere(board != shown).tolist()}
+    if hint != shown_hint:
+        cells.update(shown_hint or ())
+        cells.update(hint or ())
+
+    rects = []
+    for r, c in cells:
+        rect = pygame.Rect(c * CELL, r * CELL, CELL, CELL)
+        screen.blit(background, rect, rect)
+
+        # 🍬 BONBON
+        screen.blit(images[board[r][c]], (rect.x + 4, rect.y + 4))
+
+        # 💡 IPUCU (HINT)
+        if hint and (r, c) in hint:
+            pygame.draw.rect(screen, HINT_COLOR, rect, 3)
+        rects.append(rect)
+
+    shown[:] = board
+    shown_hint = hint
+    return rects
 
 # ---------------- GAME LOOP ----------------
 running = True
@@ -99,26 +93,24 @@ while running:
 
             # R → YENİ OYUN
             if event.key == pygame.K_r:
-                new_game()
+                game = backend.new_game(SIZE)
+
+            # H → IPUCU
+            if event.key == pygame.K_h:
+                hint = backend.hint_move(game)
 
         if event.type == pygame.MOUSEBUTTONDOWN:
             x, y = pygame.mouse.get_pos()
             r, c = y // CELL, x // CELL
+            hint = None
 
             if selected:
-                swap(selected, (r,c))
-                m = find_matches()
-                if m:
-                    remove(m)
-                    drop()
-                else:
-                    swap(selected, (r,c))
+                backend.play(game, selected, (r,c))
                 selected = None
             else:
                 selected = (r,c)
 
-    draw()
-    pygame.display.flip()
+    pygame.display.update(draw())
     clock.tick(FPS)
 
 pygame.quit()
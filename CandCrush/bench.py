@@ -0,0 +1,120 @@
+# Times swap / find_matches / remove / drop on the three board backends and
+# checks they agree, to pick the fastest one for a board size:
+#
+#   python bench.py [steps] [size ...]
+#
+# "lists" is the original list-of-lists code, kept here as the baseline.
+# Every backend starts from the same random board (with matches on it) and
+# runs the same number of cascade steps from the same refill seed.
+
+import random
+import sys
+import time
+
+import numpy as np
+
+import bitboard
+import engine
+
+
+# ---------------- LIST-OF-LISTS ----------------
+def lists_find_matches(board):
+    size = len(board)
+    matches = set()
+
+    for r in range(size):
+        for c in range(size - 2):
+            if board[r][c] == board[r][c+1] == board[r][c+2]:
+                matches.update({(r,c), (r,c+1), (r,c+2)})
+
+    for c in range(size):
+        for r in range(size - 2):
+            if board[r][c] == board[r+1][c] == board[r+2][c]:
+                matches.update({(r,c), (r+1,c), (r+2,c)})
+
+    return matches
+
+
+def lists_remove(board, matches):
+    for r,c in matches:
+        board[r][c] = -1
+    return len(matches)
+
+
+def lists_drop(board, rng):
+    # draws the same candies as engine.refill(): one byte per hole
+    size = len(board)
+    new = iter(rng.randbytes(sum(row.count(-1) for row in board)))
+    for c in range(size):
+        col = [board[r][c] for r in range(size) if board[r][c] != -1]
+        while len(col) < size:
+            col.insert(0, next(new) % engine.COLORS)
+        for r in range(size):
+            board[r][c] = col[r]
+
+
+def run_lists(start, steps, seed):
+    board = start.tolist()
+    rng = random.Random(seed)
+    score = 0
+    for _ in range(steps):
+        m = lists_find_matches(board)
+        if not m:
+            break
+        score += lists_remove(board, m)
+        lists_drop(board, rng)
+    return np.array(board, dtype=np.int8), score
+
+
+# ---------------- NUMPY / BITBOARD ----------------
+def run_numpy(start, steps, seed):
+    size = start.shape[0]
+    game = {"size": size, "board": start.copy(), "rng": random.Random(seed), "score": 0,
+            "dirty": {c: (0, size - 1) for c in range(size)}, "moves_dirty": {}}
+    for _ in range(steps):
+        m = engine.find_matches(game)
+        if not len(m[0]):
+            break
+        engine.remove(game, m)
+        engine.drop(game)
+    return game["board"], game["score"]
+
+
+def run_bitboard(start, steps, seed):
+    game = bitboard.from_board(start, seed)
+    for _ in range(steps):
+        m = bitboard.find_matches(game)
+        if not m:
+            break
+        bitboard.remove(game, m)
+        bitboard.drop(game)
+    return bitboard.to_array(game), game["score"]
+
+
+BACKENDS = {"lists": run_lists, "numpy": run_numpy, "bitboard": run_bitboard}
+
+
+def bench(size, steps, seed=0):
+    start = np.random.default_rng(seed).integers(0, engine.COLORS, (size, size)).astype(np.int8)
+    times, results = {}, {}
+    for name, run in BACKENDS.items():
+        t = time.perf_counter()
+        results[name] = run(start, steps, seed)
+        times[name] = time.perf_counter() - t
+
+    board, score = results["numpy"]
+    for name, (other, other_score) in results.items():
+        assert (other == board).all() and other_score == score, f"{name} disagrees at size {size}"
+    return times
+
+
+if __name__ == "__main__":
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    sizes = [int(a) for a in sys.argv[2:]] or [8, 32, 128, 512]
+
+    print(f"{steps} cascade steps, ms per step")
+    print(f"{'size':>6}" + "".join(f"{name:>10}" for name in BACKENDS) + "   fastest")
+    for size in sizes:
+        times = bench(size, steps)
+        row = "".join(f"{times[name] / steps * 1000:>10.2f}" for name in BACKENDS)
+        print(f"{size:>6}{row}   {min(times, key=times.get)}")
@@ -0,0 +1,217 @@
+# Bitboard backend for CandyCrush.py: one Python int per colour, bit
+# r * stride + c set when (r, c) holds that colour. Every row is followed by
+# GUARD empty columns, so shifting by up to GUARD bits can never carry a
+# candy into the neighbouring row and triples need no column masks.
+#
+# Same game-dict API as engine.py for swap / find_matches / remove / drop /
+# clear_matches / play / hint_move. Matches are a bitmask instead of index
+# arrays, and game["board"] is a NumPy snapshot refreshed after every play()
+# for drawing.
+
+import random
+
+import numpy as np
+
+import engine
+
+GUARD = 3
+
+
+# ---------------- BOARD ----------------
+def new_game(size, seed=None):
+    game = from_board(engine.generate_board(size, np.random.default_rng(seed), ensure_move=True), seed)
+    update_moves(game)
+    return game
+
+
+def from_board(board, seed=None):
+    size = board.shape[0]
+    game = {
+        "size": size,
+        "stride": size + GUARD,
+        "rng": random.Random(seed),
+        "score": 0,
+        "board": board.copy(),
+    }
+    game["full"] = to_mask(game, np.ones((size, size), dtype=bool))
+    pack(game, board)
+    return game
+
+
+def to_mask(game, cells):
+    # (size, size) bool array -> int bitmask in the game's layout
+    size, stride = game["size"], game["stride"]
+    padded = np.zeros((size, stride), dtype=bool)
+    padded[:, :size] = cells
+    return int.from_bytes(np.packbits(padded, bitorder="little").tobytes(), "little")
+
+
+def to_cells(game, mask):
+    # int bitmask -> (size, size) bool array
+    size, stride = game["size"], game["stride"]
+    n = size * stride
+    raw = np.frombuffer(mask.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:n].reshape(size, stride)[:, :size].astype(bool)
+
+
+def pack(game, board):
+    game["masks"] = [to_mask(game, board == k) for k in range(engine.COLORS)]
+
+
+def to_array(game):
+    board = np.full((game["size"], game["size"]), -1, dtype=np.int8)
+    for k, m in enumerate(game["masks"]):
+        board[to_cells(game, m)] = k
+    return board
+
+
+def color_at(game, i):
+    for k, m in enumerate(game["masks"]):
+        if m >> i & 1:
+            return k
+    return -1
+
+
+def swap(game, a, b):
+    stride, masks = game["stride"], game["masks"]
+    ia, ib = a[0] * stride + a[1], b[0] * stride + b[1]
+    ka, kb = color_at(game, ia), color_at(game, ib)
+    if ka != kb:
+        flip = (1 << ia) | (1 << ib)
+        masks[ka] ^= flip
+        masks[kb] ^= flip
+
+
+# ---------------- MATCHES ----------------
+def find_matches(game):
+    # bitmask of every cell in a horizontal or vertical triple
+    stride = game["stride"]
+    matches = 0
+    for m in game["masks"]:
+        h = m & (m >> 1) & (m >> 2)
+        v = m & (m >> stride) & (m >> 2 * stride)
+        matches |= h | (h << 1) | (h << 2) | v | (v << stride) | (v << 2 * stride)
+    return matches
+
+
+def remove(game, matches):
+    masks = game["masks"]
+    for k in range(len(masks)):
+        masks[k] &= ~matches
+    game["score"] += matches.bit_count()
+
+
+def drop(game):
+    stride, full, masks = game["stride"], game["full"], game["masks"]
+    occupied = 0
+    for m in masks:
+        occupied |= m
+
+    # every candy with a hole right below it falls one row, all at once,
+    # until the holes have bubbled up to the top of their columns
+    while True:
+        moving = occupied & ((full & ~occupied) >> stride)
+        if not moving:
+            break
+        for k in range(len(masks)):
+            fall = masks[k] & moving
+            if fall:
+                masks[k] ^= fall | (fall << stride)
+        occupied ^= moving | (moving << stride)
+
+    holes = to_cells(game, full & ~occupied)
+    missing = np.count_nonzero(holes, axis=0)
+    if not missing.any():
+        return
+    depth = int(missing.max())
+    fill = np.full((game["size"], game["size"]), -1, dtype=np.int8)
+    fill[:depth] = engine.refill(game["rng"], missing, depth)
+    for k in range(len(masks)):
+        masks[k] |= to_mask(game, fill == k)
+
+
+def clear_matches(game):
+    # remove/drop until the board is stable; returns the cascade depth
+    depth = 0
+    m = find_matches(game)
+    while m:
+        remove(game, m)
+        drop(game)
+        depth += 1
+        m = find_matches(game)
+    return depth
+
+
+# ---------------- MOVES ----------------
+def legal_masks(game):
+    # bit (r, c) of the first mask: swapping (r, c) with (r, c + 1) makes a
+    # triple; of the second: swapping (r, c) with (r + 1, c) does.
+    # Only valid on a stable board
+    w, full = game["stride"], game["full"]
+    h_legal = v_legal = 0
+    for m in game["masks"]:
+        # m lines up with the cell at bit i along a row / a column
+        across_row = ((m << 2) & (m << 1)) | ((m << 1) & (m >> 1)) | ((m >> 1) & (m >> 2))
+        across_col = ((m << 2 * w) & (m << w)) | ((m << w) & (m >> w)) | ((m >> w) & (m >> 2 * w))
+
+        # (r, c + 1) moves left onto (r, c) / (r, c) moves right onto (r, c + 1)
+        h_legal |= (m >> 1) & (((m << 2) & (m << 1)) | across_col)
+        h_legal |= m & (((m >> 2) & (m >> 3)) | (across_col >> 1))
+
+        # (r + 1, c) moves up onto (r, c) / (r, c) moves down onto (r + 1, c)
+        v_legal |= (m >> w) & (((m << 2 * w) & (m << w)) | across_row)
+        v_legal |= m & (((m >> 2 * w) & (m >> 3 * w)) | (across_row >> w))
+    return h_legal & full, v_legal & full
+
+
+def update_moves(game):
+    game["h_legal"], game["v_legal"] = legal_masks(game)
+    game["board"] = to_array(game)
+
+
+def is_legal(game, a, b):
+    (r, c), (r2, c2) = sorted((a, b))
+    i = r * game["stride"] + c
+    if r == r2 and c2 == c + 1:
+        return bool(game["h_legal"] >> i & 1)
+    if c == c2 and r2 == r + 1:
+        return bool(game["v_legal"] >> i & 1)
+    return False
+
+
+def hint_move(game):
+    for mask, (dr, dc) in ((game["h_legal"], (0, 1)), (game["v_legal"], (1, 0))):
+        if mask:
+            r, c = divmod((mask & -mask).bit_length() - 1, game["stride"])
+            return (r, c), (r + dr, c + dc)
+    return None
+
+
+def reshuffle(game):
+    # deal the same candies again until the stable board has a legal move
+    size = game["size"]
+    if size < engine.MIN_SIZE:
+        raise ValueError(f"a {size}x{size} board can never have a move")
+    kept = game["score"]
+    for _ in range(engine.MAX_DEALS):
+        cells = to_array(game).ravel().tolist()
+        game["rng"].shuffle(cells)
+        pack(game, np.array(cells, dtype=np.int8).reshape(size, size))
+        clear_matches(game)
+        update_moves(game)
+        if game["h_legal"] or game["v_legal"]:
+            game["score"] = kept
+            return
+    raise RuntimeError(f"no deal of the {size}x{size} board has a move after {engine.MAX_DEALS} tries")
+
+
+def play(game, a, b):
+    # the move a player makes: legal swap, full cascade, reshuffle if stuck
+    if not is_legal(game, a, b):
+        return None
+    swap(game, a, b)
+    depth = clear_matches(game)
+    update_moves(game)
+    if not (game["h_legal"] or game["v_legal"]):
+        reshuffle(game)
+    return depth
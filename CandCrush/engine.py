@@ -0,0 +1,408 @@
+# Board logic for CandyCrush.py, with no pygame dependency so it can run
+# headless: bots, balancing studies and the best-move search below.
+#
+# A game is a dict (see new_game) and every function takes it first.
+
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+COLORS = 4
+# a board smaller than 3x3 has no room for a triple, so it can never have a
+# move; bigger ones get a fresh deal until they do, but only so many
+MIN_SIZE = 3
+MAX_DEALS = 100
+
+
+# ---------------- BOARD ----------------
+def generate_board(size, rng=None, ensure_move=False):
+    # a cell only has to avoid the colour of an equal pair directly to its
+    # left or directly above it. Those four cells all lie on earlier
+    # anti-diagonals, so the board is filled one whole diagonal at a time
+    if ensure_move and size < MIN_SIZE:
+        raise ValueError(f"a {size}x{size} board can never have a move")
+    if rng is None:
+        rng = np.random.default_rng()
+    rows = np.arange(size)[:, None]
+
+    for _ in range(MAX_DEALS):
+        # diag[d + 2, r + 2] holds cell (r, d - r); the padding stays -1
+        diag = np.full((2 * size + 1, size + 2), -1, dtype=np.int8)
+        for d in range(2 * size - 1):
+            lo, hi = max(0, d - size + 1), min(d, size - 1) + 1
+            left, left2 = diag[d + 1, lo + 2:hi + 2], diag[d, lo + 2:hi + 2]
+            up, up2 = diag[d + 1, lo + 1:hi + 1], diag[d, lo:hi]
+            first = np.where(left == left2, left, -1)
+            second = np.where(up == up2, up, -1)
+            first, second = np.minimum(first, second), np.maximum(first, second)
+            first[first == second] = -1
+
+            # uniform over the allowed colours: 12 splits evenly into 2, 3 or 4
+            # choices, then step over the forbidden ones in ascending order
+            allowed = COLORS - (first >= 0) - (second >= 0)
+            pick = rng.integers(0, 12, hi - lo, dtype=np.int8) % allowed.astype(np.int8)
+            pick += (first >= 0) & (pick >= first)
+            pick += (second >= 0) & (pick >= second)
+            diag[d + 2, lo + 2:hi + 2] = pick
+        grid = diag[rows + np.arange(size) + 2, rows + 2]
+
+        if (not ensure_move or legal_swaps(grid, 0, size, 0, size - 1, 0, 1).any()
+                or legal_swaps(grid, 0, size - 1, 0, size, 1, 0).any()):
+            return grid
+    raise RuntimeError(f"no {size}x{size} board with a move in {MAX_DEALS} deals")
+
+
+def new_game(size, seed=None):
+    game = {
+        "size": size,
+        "board": generate_board(size, np.random.default_rng(seed), ensure_move=True),
+        # refills use their own stream so simulations never share state
+        "rng": random.Random(seed),
+        "score": 0,
+        # changed cells since the last find_matches() / update_moves(),
+        # as {column: (top_row, bottom_row)}
+        "dirty": {},
+        "moves_dirty": {},
+        # legal swaps of (r, c) with its right / lower neighbour, plus how many
+        # start in each row so hint_move() never has to scan the whole index
+        "h_moves": np.zeros((size, size - 1), dtype=bool),
+        "v_moves": np.zeros((size - 1, size), dtype=bool),
+        "row_moves": np.zeros(size, dtype=np.int64),
+    }
+    for c in range(size):
+        mark_dirty(game, c, 0, size - 1)
+
+    # nothing to clear on a generated board, this just builds the move index
+    cascade(game)
+    game["score"] = 0
+    return game
+
+
+def copy_game(game, seed=None):
+    # board-only copy for rollouts: no move index, fresh refill stream
+    return {
+        "size": game["size"],
+        "board": game["board"].copy(),
+        "rng": random.Random(seed),
+        "score": 0,
+        "dirty": {},
+        "moves_dirty": {},
+    }
+
+
+def mark_dirty(game, c, top, bottom):
+    for spans in (game["dirty"], game["moves_dirty"]):
+        if c in spans:
+            t, b = spans[c]
+            spans[c] = (min(t, top), max(b, bottom))
+        else:
+            spans[c] = (top, bottom)
+
+
+def swap(game, a, b):
+    board = game["board"]
+    board[a], board[b] = board[b], board[a]
+    mark_dirty(game, a[1], a[0], a[0])
+    mark_dirty(game, b[1], b[0], b[0])
+
+
+# ---------------- MATCHES ----------------
+def find_all_matches(board):
+    # boolean mask of every cell that is part of a horizontal or vertical triple
+    matches = np.zeros(board.shape, dtype=bool)
+
+    h = (board[:, :-2] == board[:, 1:-1]) & (board[:, 1:-1] == board[:, 2:])
+    matches[:, :-2] |= h
+    matches[:, 1:-1] |= h
+    matches[:, 2:] |= h
+
+    v = (board[:-2, :] == board[1:-1, :]) & (board[1:-1, :] == board[2:, :])
+    matches[:-2, :] |= v
+    matches[1:-1, :] |= v
+    matches[2:, :] |= v
+
+    return matches
+
+
+def find_matches(game):
+    # only triples that overlap a changed cell can be new, so scan the dirty
+    # windows and return the matched cells as (rows, cols) index arrays
+    board, size, dirty = game["board"], game["size"], game["dirty"]
+    if len(dirty) * 4 > size:
+        dirty.clear()
+        return np.nonzero(find_all_matches(board))
+
+    rows, cols = [], []
+    for c, (top, bottom) in dirty.items():
+        # vertical triples through the changed span of this column
+        lo, hi = max(top - 2, 0), min(bottom + 3, size)
+        seg = board[lo:hi, c]
+        v = np.flatnonzero((seg[:-2] == seg[1:-1]) & (seg[1:-1] == seg[2:])) + lo
+        for k in range(3):
+            rows.append(v + k)
+            cols.append(np.full(len(v), c))
+
+        # horizontal triples that include this column
+        left, right = max(c - 2, 0), min(c + 3, size)
+        block = board[top:bottom + 1, left:right]
+        hr, hc = np.nonzero((block[:, :-2] == block[:, 1:-1]) & (block[:, 1:-1] == block[:, 2:]))
+        for k in range(3):
+            rows.append(hr + top)
+            cols.append(hc + left + k)
+    dirty.clear()
+
+    if not rows:
+        return np.array([], dtype=np.intp), np.array([], dtype=np.intp)
+    cells = np.unique(np.concatenate(rows) * size + np.concatenate(cols))
+    return np.divmod(cells, size)
+
+
+def remove(game, matches):
+    rows, cols = matches
+    game["board"][rows, cols] = -1
+    game["score"] += len(rows)
+
+    # only the lowest hole matters: drop() rewrites everything above it
+    bottoms = np.full(game["size"], -1)
+    np.maximum.at(bottoms, cols, rows)
+    for c in np.flatnonzero(bottoms >= 0):
+        mark_dirty(game, int(c), 0, int(bottoms[c]))
+
+
+def drop(game):
+    # only the dirty columns can have holes, and only down to their lowest
+    # changed row
+    board, dirty = game["board"], game["dirty"]
+    if not dirty:
+        return
+    cols = np.array(sorted(dirty))
+    depth = max(bottom for _, bottom in dirty.values()) + 1
+    part = board[:depth, cols]
+
+    # stable sort on "kept" pushes the holes to the top of every column
+    # while the surviving candies keep their order
+    kept = part != -1
+    order = np.argsort(kept, axis=0, kind="stable")
+    part = np.take_along_axis(part, order, axis=0)
+
+    # refill the holes now sitting at the top of each column
+    fill = refill(game["rng"], depth - np.count_nonzero(kept, axis=0), depth)
+    holes = fill >= 0
+    part[holes] = fill[holes]
+    board[:depth, cols] = part
+
+
+def refill(rng, missing, depth):
+    # new candies for the top missing[c] cells of each column of a
+    # depth-row strip, -1 elsewhere. Columns are filled in order and the
+    # first value drawn for a column lands just above its surviving candies.
+    # All of them come from one randbytes() call, a byte per candy: 256
+    # splits evenly into the colours
+    fill = np.full((depth, len(missing)), -1, dtype=np.int8)
+    total = int(missing.sum())
+    if total:
+        new = (np.frombuffer(rng.randbytes(total), dtype=np.uint8) % COLORS).astype(np.int8)
+        start = np.cumsum(missing) - missing
+        rows = np.arange(depth)[:, None]
+        holes = rows < missing
+        idx = start + missing - 1 - rows
+        fill[holes] = new[idx[holes]]
+    return fill
+
+
+def clear_matches(game):
+    # remove/drop until the board is stable; returns the cascade depth
+    depth = 0
+    m = find_matches(game)
+    while len(m[0]):
+        remove(game, m)
+        drop(game)
+        depth += 1
+        m = find_matches(game)
+    return depth
+
+
+def cascade(game):
+    # clear_matches(), then refresh the move index
+    depth = clear_matches(game)
+    update_moves(game)
+    return depth
+
+
+def reshuffle(game):
+    # deal the same candies again until the stable board has a legal move
+    board, size = game["board"], game["size"]
+    if size < MIN_SIZE:
+        raise ValueError(f"a {size}x{size} board can never have a move")
+    kept = game["score"]
+    for _ in range(MAX_DEALS):
+        cells = board.ravel().tolist()
+        game["rng"].shuffle(cells)
+        board[:] = np.array(cells, dtype=np.int8).reshape(size, size)
+        for c in range(size):
+            mark_dirty(game, c, 0, size - 1)
+        cascade(game)
+        if game["row_moves"].any():
+            game["score"] = kept
+            return
+    raise RuntimeError(f"no deal of the {size}x{size} board has a move after {MAX_DEALS} tries")
+
+
+# ---------------- MOVES ----------------
+def legal_swaps(grid, r0, r1, c0, c1, dr, dc):
+    # for every (r, c) in [r0, r1) x [c0, c1): does swapping it with
+    # (r + dr, c + dc) make a triple? Reads a copy of the grid padded with -2
+    window = np.full((r1 - r0 + 6, c1 - c0 + 6), -2, dtype=np.int8)
+    top, bottom = max(r0 - 3, 0), min(r1 + 3, grid.shape[0])
+    left, right = max(c0 - 3, 0), min(c1 + 3, grid.shape[1])
+    window[top - r0 + 3:bottom - r0 + 3, left - c0 + 3:right - c0 + 3] = grid[top:bottom, left:right]
+
+    def at(i, j):
+        return window[3 + i:3 + i + r1 - r0, 3 + j:3 + j + c1 - c0]
+
+    def across(v, i, j):
+        # v lands on (i, j) and lines up with the cells beside it
+        a = at(i - dc, j - dr) == v
+        b = at(i + dc, j + dr) == v
+        return (a & (at(i - 2 * dc, j - 2 * dr) == v)) | (a & b) | (b & (at(i + 2 * dc, j + 2 * dr) == v))
+
+    x, y = at(0, 0), at(dr, dc)
+    legal = (at(-2 * dr, -2 * dc) == y) & (at(-dr, -dc) == y)
+    legal |= (at(2 * dr, 2 * dc) == x) & (at(3 * dr, 3 * dc) == x)
+    legal |= across(y, 0, 0) | across(x, dr, dc)
+    return legal & (x != y)
+
+
+def refresh_moves(game, moves, r0, r1, c0, c1, dr, dc):
+    r0, c0 = max(r0, 0), max(c0, 0)
+    r1, c1 = min(r1, moves.shape[0]), min(c1, moves.shape[1])
+    if r0 >= r1 or c0 >= c1:
+        return
+    legal = legal_swaps(game["board"], r0, r1, c0, c1, dr, dc)
+    game["row_moves"][r0:r1] += legal.sum(axis=1) - moves[r0:r1, c0:c1].sum(axis=1)
+    moves[r0:r1, c0:c1] = legal
+
+
+def update_moves(game):
+    # a swap can only change legality if a changed cell is inside the
+    # 5x6 / 6x5 neighbourhood it reads
+    size, moves_dirty = game["size"], game["moves_dirty"]
+    h_moves, v_moves = game["h_moves"], game["v_moves"]
+    if len(moves_dirty) * 4 > size:
+        moves_dirty.clear()
+        refresh_moves(game, h_moves, 0, size, 0, size, 0, 1)
+        refresh_moves(game, v_moves, 0, size, 0, size, 1, 0)
+        return
+
+    for c, (top, bottom) in moves_dirty.items():
+        refresh_moves(game, h_moves, top - 2, bottom + 3, c - 3, c + 3, 0, 1)
+        refresh_moves(game, v_moves, top - 3, bottom + 3, c - 2, c + 3, 1, 0)
+    moves_dirty.clear()
+
+
+def is_legal(game, a, b):
+    (r, c), (r2, c2) = sorted((a, b))
+    if r == r2 and c2 == c + 1:
+        return bool(game["h_moves"][r, c])
+    if c == c2 and r2 == r + 1:
+        return bool(game["v_moves"][r, c])
+    return False
+
+
+def hint_move(game):
+    rows = np.flatnonzero(game["row_moves"])
+    if not len(rows):
+        return None
+    r = int(rows[0])
+    h_moves, v_moves = game["h_moves"], game["v_moves"]
+    if h_moves[r].any():
+        c = int(h_moves[r].argmax())
+        return (r, c), (r, c + 1)
+    c = int(v_moves[r].argmax())
+    return (r, c), (r + 1, c)
+
+
+def legal_moves(game):
+    moves = [((r, c), (r, c + 1)) for r, c in zip(*np.nonzero(game["h_moves"]))]
+    moves += [((r, c), (r + 1, c)) for r, c in zip(*np.nonzero(game["v_moves"]))]
+    return [((int(a), int(b)), (int(c), int(d))) for (a, b), (c, d) in moves]
+
+
+def play(game, a, b):
+    # the move a player makes: legal swap, full cascade, reshuffle if stuck
+    if not is_legal(game, a, b):
+        return None
+    swap(game, a, b)
+    depth = cascade(game)
+    if not game["row_moves"].any():
+        reshuffle(game)
+    return depth
+
+
+# ---------------- SEARCH ----------------
+def evaluate_move(board, move, rollouts, seed=0):
+    # mean cascade depth and score of one swap over `rollouts` random refills.
+    # Rollout k uses seed + k for every move, so moves are compared on the
+    # same refills
+    game = {"size": board.shape[0], "board": board}
+    depth = score = 0
+    for k in range(rollouts):
+        trial = copy_game(game, seed + k)
+        swap(trial, *move)
+        depth += clear_matches(trial)
+        score += trial["score"]
+    return move, depth / rollouts, score / rollouts
+
+
+# the board being ranked, in a rank_moves() worker. The pool's initializer
+# sends it once per worker, so the tasks only carry the move
+_board = None
+
+
+def _init(board):
+    global _board
+    _board = board
+
+
+def _evaluate(args):
+    return evaluate_move(_board, *args)
+
+
+def rank_moves(game, rollouts=32, processes=None, seed=0):
+    # (move, expected depth, expected score) for every legal move, best first
+    board, moves = game["board"], legal_moves(game)
+    if processes == 1 or len(moves) < 2:
+        results = [evaluate_move(board, move, rollouts, seed) for move in moves]
+    else:
+        workers = processes or os.cpu_count() or 1
+        tasks = [(move, rollouts, seed) for move in moves]
+        with Pool(workers, _init, (board,)) as pool:
+            results = pool.map(_evaluate, tasks, chunksize=max(1, len(tasks) // (4 * workers)))
+    return sorted(results, key=lambda r: (r[2], r[1]), reverse=True)
+
+
+def best_move(game, rollouts=32, processes=None, seed=0):
+    ranked = rank_moves(game, rollouts, processes, seed)
+    return ranked[0][0] if ranked else None
+
+
+if __name__ == "__main__":
+    # python engine.py [size] [rollouts] [processes]
+    # plays a few bot moves and reports evaluated positions per second
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    rollouts = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    game = new_game(size, seed=0)
+    positions = 0
+    start = time.perf_counter()
+    for turn in range(10):
+        ranked = rank_moves(game, rollouts, processes, seed=turn * rollouts)
+        positions += len(ranked) * rollouts
+        play(game, *ranked[0][0])
+    elapsed = time.perf_counter() - start
+    print(f"{positions} positions in {elapsed:.2f}s: {positions / elapsed:.0f}/s, score {game['score']}")
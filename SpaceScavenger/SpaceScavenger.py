@@ -1,6 +1,17 @@
-import random, sys, pygame
+import os, random, sys, time, pygame
+from collections import OrderedDict, defaultdict
 from pygame.locals import *
 
+import collisions
+import entities
+import profiler
+import scene
+import sounds
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import assets
+import textcache
+
 # Screen dimensions
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
@@ -14,19 +25,45 @@ BLACK = (0, 0, 0)
 # Object constants
 INITIAL_SIZE = 70
 INITIAL_SPEED = 3
+INITIAL_DAMAGE = 5
 DAMAGE_INCREMENT = 5
+SPAWN_CHANCE = 0.02
+
+# game logic runs in fixed steps, independent of the frame rate. Speeds and
+# spawn chances above are per 1/60 s, so each step applies STEP_SCALE of them
+LOGIC_HZ = 120
+STEP_MS = 1000 / LOGIC_HZ
+STEP_SCALE = 60 / LOGIC_HZ
+MAX_FRAME_MS = 250  # a longer stall is not caught up, so the game pauses instead
+
+# scaled asteroid sprites kept around, and how many difficulty levels are built at startup
+ASTEROID_CACHE_SIZE = 8
+PREBUILT_LEVELS = 6
+ASTEROID_SPRITES = OrderedDict()  # damage -> surface
+
+# height of the progress bar strip along the bottom of the screen
+HUD_HEIGHT = 90
+
+# F3 toggles the frame profiler overlay; --profile [file.csv] starts with it
+# on and writes every frame's phase times to the file
+PROFILE_PHASES = ("events", "move_spaceship", "create_objects", "move_objects",
+                  "remove_offscreen_objects", "detect_collisions", "rules", "draw_objects",
+                  "draw_progress_bars", "game_over_message", "overlay", "draw", "display_update", "tick")
 
 
 def reset_game():
     # initialize game variables
     return {
-        "spaceship": {"x": 50, "y": SCREEN_HEIGHT // 2 - 60},
+        "spaceship": {"x": 50, "y": SCREEN_HEIGHT // 2 - 60, "prev_y": SCREEN_HEIGHT // 2 - 60},
         "life_points": 100,
         "crystal_points": 0,
-        "asteroids": [],
-        "crystals": [],
+        "asteroids": entities.new_store(),
+        "crystals": entities.new_store(),
+        "asteroid_index": collisions.new_index(),
+        "crystal_index": collisions.new_index(),
         "speed": INITIAL_SPEED,
-        "damage": 5,
+        "step_dx": 0,
+        "damage": INITIAL_DAMAGE,
         "game_over": False,
         "win": False,
         "timer": 0,
@@ -35,52 +72,81 @@ def reset_game():
 
 def move_spaceship(keys):
     if keys[pygame.K_UP] and GAME["spaceship"]["y"] > 10:
-        GAME["spaceship"]["y"] -= GAME["speed"]
+        GAME["spaceship"]["y"] -= GAME["speed"] * STEP_SCALE
     if keys[pygame.K_DOWN] and GAME["spaceship"]["y"] < SCREEN_HEIGHT - 150:
-        GAME["spaceship"]["y"] += GAME["speed"]
+        GAME["spaceship"]["y"] += GAME["speed"] * STEP_SCALE
 
 
 def create_objects():
     # create new asteroids and crystals
-    if len(GAME["asteroids"]) < 1 or random.randint(0, 99) <= 1:
-        GAME["asteroids"].append({"x": SCREEN_WIDTH, "y": random.randint(0, SCREEN_HEIGHT - 150 - GAME["damage"])})
-    if len(GAME["crystals"]) < 1 or random.randint(0, 99) <= 1:
-        GAME["crystals"].append({"x": SCREEN_WIDTH, "y": random.randint(0, SCREEN_HEIGHT - 150)})
+    if GAME["asteroids"]["count"] < 1 or random.random() < SPAWN_CHANCE * STEP_SCALE:
+        entities.spawn(GAME["asteroids"], SCREEN_WIDTH, random.randint(0, SCREEN_HEIGHT - 150 - GAME["damage"]))
+    if GAME["crystals"]["count"] < 1 or random.random() < SPAWN_CHANCE * STEP_SCALE:
+        entities.spawn(GAME["crystals"], SCREEN_WIDTH, random.randint(0, SCREEN_HEIGHT - 150))
 
 
 def move_objects():
-    for asteroid in GAME["asteroids"]:
-        asteroid["x"] -= GAME["speed"]
-    for crystal in GAME["crystals"]:
-        crystal["x"] -= GAME["speed"]
+    # everything scrolls by the same step_dx, which is all draw_objects needs to interpolate
+    GAME["step_dx"] = GAME["speed"] * STEP_SCALE
+    entities.move(GAME["asteroids"], -GAME["step_dx"])
+    entities.move(GAME["crystals"], -GAME["step_dx"])
 
 
 def remove_offscreen_objects():
-    GAME["asteroids"] = [a for a in GAME["asteroids"] if a["x"] > -150]
-    GAME["crystals"] = [c for c in GAME["crystals"] if c["x"] > -150]
+    entities.cull_left_of(GAME["asteroids"], -150)
+    entities.cull_left_of(GAME["crystals"], -150)
+
+
+def asteroid_sprite(damage):
+    # the asteroid surface for a damage level, with its "- damage" label,
+    # built once per level and kept in a small LRU
+    if damage in ASTEROID_SPRITES:
+        ASTEROID_SPRITES.move_to_end(damage)
+        return ASTEROID_SPRITES[damage]
+
+    size = INITIAL_SIZE + 2 * damage
+    sprite = labelled(pygame.transform.scale(ASTEROID_IMG, (size, size)), f"- {damage}", (75 + 2 * damage, 30 + damage))
+    ASTEROID_SPRITES[damage] = sprite
+    if len(ASTEROID_SPRITES) > ASTEROID_CACHE_SIZE:
+        ASTEROID_SPRITES.popitem(last=False)
+    return ASTEROID_SPRITES[damage]
+
+
+def asteroid_hitbox(damage):
+    # (dx, dy, w, h) of an asteroid's collision rect relative to its position
+    size = INITIAL_SIZE + 2 * damage
+    return 0, 25, size, size - 45
+
+
+def crystal_hitbox():
+    return 5, 20, INITIAL_SIZE - 15, INITIAL_SIZE - 35
 
 
 def detect_collisions():
+    if GAME["game_over"]:
+        return
+
     # the dimensions are a bit off, to take into account the padding of the image objects
-    spaceship_rect = pygame.Rect(GAME["spaceship"]["x"], GAME["spaceship"]["y"], INITIAL_SIZE, INITIAL_SIZE - 15)
-
-    for asteroid in GAME["asteroids"]:
-        asteroid_rect = pygame.Rect(asteroid["x"], asteroid["y"] + 25, INITIAL_SIZE + 2 * GAME["damage"], INITIAL_SIZE + 2 * GAME["damage"] - 45)
-        if spaceship_rect.colliderect(asteroid_rect) and not GAME["game_over"]:
-            CLASH_SOUND.play()
-            GAME["life_points"] -= GAME["damage"]
-            if GAME["life_points"] < 0:
-                GAME["life_points"] = 0
-            GAME["asteroids"].remove(asteroid)
-
-    for crystal in GAME["crystals"]:
-        crystal_rect = pygame.Rect(crystal["x"] + 5, crystal["y"] + 20, INITIAL_SIZE - 15, INITIAL_SIZE - 35)
-        if spaceship_rect.colliderect(crystal_rect) and not GAME["game_over"]:
-            # BEEP_SOUND.play()
-            GAME["crystal_points"] += 5
-            if GAME["crystal_points"] > 100:
-                GAME["crystal_points"] = 100
-            GAME["crystals"].remove(crystal)
+    spaceship_rect = (GAME["spaceship"]["x"], GAME["spaceship"]["y"], INITIAL_SIZE, INITIAL_SIZE - 15)
+
+    index = collisions.build(GAME["asteroids"], *asteroid_hitbox(GAME["damage"]), index=GAME["asteroid_index"])
+    hits = collisions.query(index, spaceship_rect)
+    if len(hits):
+        sounds.play("clash")  # once per step, however many asteroids hit
+    for _ in hits:
+        GAME["life_points"] -= GAME["damage"]
+        if GAME["life_points"] < 0:
+            GAME["life_points"] = 0
+    entities.remove_many(GAME["asteroids"], hits)
+
+    index = collisions.build(GAME["crystals"], *crystal_hitbox(), index=GAME["crystal_index"])
+    hits = collisions.query(index, spaceship_rect)
+    for _ in hits:
+        # sounds.play("beep")
+        GAME["crystal_points"] += 5
+        if GAME["crystal_points"] > 100:
+            GAME["crystal_points"] = 100
+    entities.remove_many(GAME["crystals"], hits)
 
 
 def increase_difficulty():
@@ -99,134 +165,214 @@ def check_game_over():
         GAME["win"] = True
 
 
-def draw_objects():
-    # draw spaceship
-    DISPLAYSURF.blit(SPACESHIP_IMG, (GAME["spaceship"]["x"], GAME["spaceship"]["y"]))
+def update(keys):
+    # one fixed logic step. prev_y is where draw_objects interpolates the
+    # ship from, so it is kept up to date even once the ship stops moving
+    GAME["spaceship"]["prev_y"] = GAME["spaceship"]["y"]
+    if not GAME["game_over"]:
+        move_spaceship(keys)
+        profiler.mark("move_spaceship")
+        create_objects()
+        profiler.mark("create_objects")
 
-    # draw asteroids
-    for asteroid in GAME["asteroids"]:
-        scaled_asteroid = pygame.transform.scale(ASTEROID_IMG, (INITIAL_SIZE + 2 * GAME["damage"], INITIAL_SIZE + 2 * GAME["damage"]))
-        DISPLAYSURF.blit(scaled_asteroid, (asteroid["x"], asteroid["y"]))
-        font = pygame.font.Font(None, 24)
-        damage_text = font.render(f"- {GAME['damage']}", True, WHITE)
-        DISPLAYSURF.blit(damage_text, (asteroid["x"] + 75 + 2 * GAME["damage"], asteroid["y"] + 30 + GAME["damage"]))
+    move_objects()
+    profiler.mark("move_objects")
+    remove_offscreen_objects()
+    profiler.mark("remove_offscreen_objects")
 
-    # draw crystals
-    for crystal in GAME["crystals"]:
-        DISPLAYSURF.blit(CRYSTAL_IMG, (crystal["x"], crystal["y"]))
-        font = pygame.font.Font(None, 24)
-        gain_text = font.render(f"+ 5", True, WHITE)
-        DISPLAYSURF.blit(gain_text, (crystal["x"] + 65, crystal["y"] + 30))
+    if not GAME["game_over"]:
+        detect_collisions()
+        profiler.mark("detect_collisions")
 
+    # increase speed and damage every 10 seconds
+    GAME["timer"] += STEP_MS
+    if GAME["timer"] >= 10000:
+        increase_difficulty()
 
-def draw_progress_bars():
-    # DISPLAYSURF.blit(HEART_ICON, (12, SCREEN_HEIGHT - 80))
-    DISPLAYSURF.blit(CRYSTAL_ICON, (5, SCREEN_HEIGHT - 50))
+    check_game_over()
+    profiler.mark("rules")
+
+
+def labelled(image, text, pos):
+    # image with text blitted at pos, on a surface big enough for both
+    label = textcache.render(text, textcache.font(24), WHITE)
+    width = max(image.get_width(), pos[0] + label.get_width())
+    height = max(image.get_height(), pos[1] + label.get_height())
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    surface.blit(image, (0, 0))
+    surface.blit(label, pos)
+    return surface.convert_alpha()
+
+
+def draw_objects(alpha):
+    # alpha is how far render time is past the last logic step, 0..1 of a step
+    ship = GAME["spaceship"]
+    ship_y = ship["prev_y"] + (ship["y"] - ship["prev_y"]) * alpha
+    scene.place(scene.sprite(SCENE, "ship", scene.SHIP), SPACESHIP_IMG, ship["x"], ship_y)
 
-    pygame.draw.rect(DISPLAYSURF, RED, (50, SCREEN_HEIGHT - 75, GAME["life_points"] * (SCREEN_WIDTH - 100) / 100, 20))
-    pygame.draw.rect(DISPLAYSURF, YELLOW, (50, SCREEN_HEIGHT - 35, GAME["crystal_points"] * (SCREEN_WIDTH - 100) / 100, 20))
-    pygame.draw.rect(DISPLAYSURF, WHITE, (50, SCREEN_HEIGHT - 75, SCREEN_WIDTH - 100, 20), 2)
-    pygame.draw.rect(DISPLAYSURF, WHITE, (50, SCREEN_HEIGHT - 35, SCREEN_WIDTH - 100, 20), 2)
+    lag = GAME["step_dx"] * (1 - alpha)
+    scene.sync(SCENE, scene.ASTEROIDS, asteroid_sprite(GAME["damage"]), entities.positions(GAME["asteroids"]), lag)
+    scene.sync(SCENE, scene.CRYSTALS, CRYSTAL_SPRITE, entities.positions(GAME["crystals"]), lag)
 
-    font = pygame.font.Font(None, 24)
-    life_text = font.render(f"{GAME['life_points']}", True, WHITE)
-    crystals_text = font.render(f"{GAME['crystal_points']}", True, WHITE)
-    DISPLAYSURF.blit(life_text, (SCREEN_WIDTH - 40, SCREEN_HEIGHT - 73))
-    DISPLAYSURF.blit(crystals_text, (SCREEN_WIDTH - 40, SCREEN_HEIGHT - 33))
+
+def draw_progress_bars():
+    # the HUD is one sprite along the bottom, redrawn only when the points change
+    points = GAME["life_points"], GAME["crystal_points"]
+    hud = scene.sprite(SCENE, "hud", scene.HUD)
+    if SCENE.get("hud_points") == points:
+        return
+    SCENE["hud_points"] = points
+
+    top = SCREEN_HEIGHT - HUD_HEIGHT
+    surface = pygame.Surface((SCREEN_WIDTH, HUD_HEIGHT), pygame.SRCALPHA)
+    # surface.blit(HEART_ICON, (12, SCREEN_HEIGHT - 80 - top))
+    surface.blit(CRYSTAL_ICON, (5, SCREEN_HEIGHT - 50 - top))
+
+    pygame.draw.rect(surface, RED, (50, SCREEN_HEIGHT - 75 - top, GAME["life_points"] * (SCREEN_WIDTH - 100) / 100, 20))
+    pygame.draw.rect(surface, YELLOW, (50, SCREEN_HEIGHT - 35 - top, GAME["crystal_points"] * (SCREEN_WIDTH - 100) / 100, 20))
+    pygame.draw.rect(surface, WHITE, (50, SCREEN_HEIGHT - 75 - top, SCREEN_WIDTH - 100, 20), 2)
+    pygame.draw.rect(surface, WHITE, (50, SCREEN_HEIGHT - 35 - top, SCREEN_WIDTH - 100, 20), 2)
+
+    font = textcache.font(24)
+    life_text = textcache.render(f"{GAME['life_points']}", font, WHITE)
+    crystals_text = textcache.render(f"{GAME['crystal_points']}", font, WHITE)
+    surface.blit(life_text, (SCREEN_WIDTH - 40, SCREEN_HEIGHT - 73 - top))
+    surface.blit(crystals_text, (SCREEN_WIDTH - 40, SCREEN_HEIGHT - 33 - top))
+    scene.place(hud, surface.convert_alpha(), 0, top)
 
 
 def display_game_over_message():
-    font = pygame.font.Font(None, 74)
     message = "You Won!" if GAME["win"] else "You Lost!"
-    text = font.render(message, True, WHITE)
-    DISPLAYSURF.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - text.get_height()))
-    restart_text = pygame.font.Font(None, 36).render("Press R to Restart", True, WHITE)
-    DISPLAYSURF.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 20))
+    sprite = scene.sprite(SCENE, "message", scene.MESSAGE)
+    if SCENE.get("message") != message:
+        SCENE["message"] = message
+        # a screen-wide strip, from the top of the message to the bottom of the restart line
+        text = textcache.render(message, textcache.font(74), WHITE)
+        restart_text = textcache.render("Press R to Restart", textcache.font(36), WHITE)
+        surface = pygame.Surface((SCREEN_WIDTH, text.get_height() + 20 + restart_text.get_height()), pygame.SRCALPHA)
+        surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, 0))
+        surface.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, text.get_height() + 20))
+        scene.place(sprite, surface.convert_alpha(), 0, SCREEN_HEIGHT // 2 - text.get_height())
+    sprite.visible = 1
 
 
 def main():
-    global DISPLAYSURF, FPSCLOCK, GAME
-    global SPACESHIP_IMG, ASTEROID_IMG, CRYSTAL_IMG, CRYSTAL_ICON, HEART_ICON, BACKGROUND_IMG
-    global BACKGROUND_MUSIC, CLASH_SOUND, BEEP_SOUND
+    global DISPLAYSURF, FPSCLOCK, GAME, SCENE
+    global SPACESHIP_IMG, ASTEROID_IMG, CRYSTAL_IMG, CRYSTAL_SPRITE, CRYSTAL_ICON, HEART_ICON, BACKGROUND_IMG
 
     pygame.init()
 
+    # image files, loaded and transformed in the background while the window opens
+    pending = assets.preload({
+        "icon": ("assets/images/spaceship.png", []),
+        "spaceship": ("assets/images/spaceship.png", [("scale", (INITIAL_SIZE, INITIAL_SIZE))]),
+        "asteroid": ("assets/images/asteroid.png", [("rotate", -45), ("scale", (INITIAL_SIZE, INITIAL_SIZE))]),
+        "crystal": ("assets/images/energy_crystal.png", [("scale", (INITIAL_SIZE, INITIAL_SIZE))]),
+        "crystal icon": ("assets/images/energy_crystal.png", [("scale", (INITIAL_SIZE, INITIAL_SIZE)), ("scale", (45, 45))]),
+        # "heart icon": ("assets/images/heart-icon.png", [("scale", (30, 30))]),
+        # "background": ("assets/images/background_image.bmp", [("scale", (SCREEN_WIDTH, SCREEN_HEIGHT - 90))]),
+    })
+
     DISPLAYSURF = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Space Scavenger")
 
-    # image files
-    SPACESHIP_IMG = pygame.image.load("assets/images/spaceship.png")
-    ASTEROID_IMG = pygame.image.load("assets/images/asteroid.png")
-    CRYSTAL_IMG = pygame.image.load("assets/images/energy_crystal.png")
-    # HEART_ICON = pygame.image.load("assets/images/heart-icon.png")
-    # BACKGROUND_IMG = pygame.image.load("assets/images/background_image.bmp")
-
-    pygame.display.set_icon(SPACESHIP_IMG)
-
-    SPACESHIP_IMG = pygame.transform.scale(SPACESHIP_IMG, (INITIAL_SIZE, INITIAL_SIZE))
-    ASTEROID_IMG = pygame.transform.rotate(ASTEROID_IMG, -45)
-    ASTEROID_IMG = pygame.transform.scale(ASTEROID_IMG, (INITIAL_SIZE, INITIAL_SIZE))
-    CRYSTAL_IMG = pygame.transform.scale(CRYSTAL_IMG, (INITIAL_SIZE, INITIAL_SIZE))
-    CRYSTAL_ICON = pygame.transform.scale(CRYSTAL_IMG, (45, 45))
-    # HEART_ICON = pygame.transform.scale(HEART_ICON, (30, 30))
-    # BACKGROUND_IMG = pygame.transform.scale(BACKGROUND_IMG, (SCREEN_WIDTH, SCREEN_HEIGHT - 90))
-
-    # audio files
-    BACKGROUND_MUSIC = "assets/sounds/background_music.wav"
-    CLASH_SOUND = pygame.mixer.Sound("assets/sounds/clash_sound.wav")
-    # BEEP_SOUND = pygame.mixer.Sound("assets/sounds/space-scavenger_assets_sounds_beep.ogg")
-
-    pygame.mixer.music.load(BACKGROUND_MUSIC)
+    images = assets.finish(pending)
+    pygame.display.set_icon(images["icon"])
+    SPACESHIP_IMG = images["spaceship"]
+    ASTEROID_IMG = images["asteroid"]
+    CRYSTAL_IMG = images["crystal"]
+    CRYSTAL_SPRITE = labelled(CRYSTAL_IMG, "+ 5", (65, 30))
+    CRYSTAL_ICON = images["crystal icon"]
+    # HEART_ICON = images["heart icon"]
+    # BACKGROUND_IMG = images["background"]
+    for level in range(PREBUILT_LEVELS):
+        asteroid_sprite(INITIAL_DAMAGE + level * DAMAGE_INCREMENT)
+
+    # audio files, decoded up front with a channel budget each
+    if sounds.init():
+        sounds.load("clash", "assets/sounds/clash_sound.wav", channels=3, repeat_ms=80)
+        # sounds.load("beep", "assets/sounds/space-scavenger_assets_sounds_beep.ogg", channels=2, repeat_ms=50)
 
     GAME = reset_game()
 
-    # start background music
-    pygame.mixer.music.play(-1)
+    # start background music, streamed from disk
+    sounds.music("assets/sounds/background_music.wav")
 
     FPSCLOCK = pygame.time.Clock()
+    lag_ms = 0
+    if "--profile" in sys.argv:
+        args = sys.argv[sys.argv.index("--profile") + 1:]
+        profiler.start(PROFILE_PHASES, args[0] if args and args[0].endswith(".csv") else None)
 
-    while True:  # main game loop
-        DISPLAYSURF.fill(BLACK)
-        # DISPLAYSURF.blit(BACKGROUND_IMG, (0, 0))
-        GAME["timer"] += FPSCLOCK.get_time()
+    # only what changed is redrawn and sent to the display each frame
+    SCENE = scene.new_scene((SCREEN_WIDTH, SCREEN_HEIGHT), BLACK)
+    DISPLAYSURF.fill(BLACK)
+    pygame.display.flip()
 
+    while True:  # main game loop
         check_for_quit()
         for event in pygame.event.get():
             if event.type == pygame.KEYDOWN:
                 if GAME["game_over"] and event.key == pygame.K_r:
                     GAME = reset_game()
+                if event.key == pygame.K_F3:
+                    profiler.toggle(PROFILE_PHASES)
+        profiler.mark("events")
 
-        if not GAME["game_over"]:
-            keys = pygame.key.get_pressed()
-            move_spaceship(keys)
-
-        if not GAME["game_over"]:
-            create_objects()
+        # run as many logic steps as the elapsed time calls for, then draw
+        # in between the last two of them
+        lag_ms += min(FPSCLOCK.get_time(), MAX_FRAME_MS)
+        keys = pygame.key.get_pressed()
+        while lag_ms >= STEP_MS:
+            update(keys)
+            lag_ms -= STEP_MS
 
-        move_objects()
-        remove_offscreen_objects()
-
-        if not GAME["game_over"]:
-            detect_collisions()
-
-        # increase speed and damage every 10 seconds
-        if GAME["timer"] >= 10000:
-            increase_difficulty()
-
-        check_game_over()
-
-        draw_objects()
+        draw_objects(lag_ms / STEP_MS)
+        profiler.mark("draw_objects")
 
         draw_progress_bars()
+        profiler.mark("draw_progress_bars")
 
         if GAME["game_over"]:
             display_game_over_message()
-
-        pygame.display.flip()
+            profiler.mark("game_over_message")
+        else:
+            scene.hide(scene.sprite(SCENE, "message", scene.MESSAGE))
+
+        overlay = scene.sprite(SCENE, "overlay", scene.OVERLAY)
+        if profiler.running():
+            panel = profiler.panel(textcache.font(16, "monospace", system=True), textcache.render)
+            scene.place(overlay, panel, SCREEN_WIDTH - panel.get_width() - 5, 5)
+            profiler.mark("overlay")
+        else:
+            scene.hide(overlay)
+
+        rects = scene.draw(SCENE, DISPLAYSURF)
+        profiler.mark("draw")
+        pygame.display.update(rects)
+        profiler.mark("display_update")
         FPSCLOCK.tick(60)
+        profiler.mark("tick")
+        profiler.end_frame()
+
+
+def run_headless(steps, seed=None):
+    # game logic only, no window or sound: a fresh game whenever one ends
+    global GAME
+    random.seed(seed)
+    GAME = reset_game()
+    keys = defaultdict(bool)
+    games = 1
+    for _ in range(steps):
+        update(keys)
+        if GAME["game_over"]:
+            GAME = reset_game()
+            games += 1
+    return games
 
 
 def terminate():
+    profiler.stop()
     pygame.quit()
     sys.exit()
 
@@ -241,4 +387,13 @@ def check_for_quit():
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    if "--headless" in sys.argv:
+        # python SpaceScavenger.py --headless [steps]
+        args = [a for a in sys.argv[1:] if a != "--headless"]
+        steps = int(args[0]) if args else 100000
+        start = time.perf_counter()
+        games = run_headless(steps, seed=0)
+        elapsed = time.perf_counter() - start
+        print(f"{steps} steps ({games} games) in {elapsed:.2f}s: {steps / elapsed:.0f} steps/s")
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,76 @@
+# Compares the sweep-and-prune broadphase with the old per-object
+# pygame.Rect loop and checks that both find the same hits:
+#
+#   python bench.py [objects] [frames]
+
+import random
+import sys
+import time
+
+import pygame
+
+import collisions
+import entities
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+HITBOX = (0, 25, 90, 45)
+SHIP = (50, 240, 70, 55)
+
+
+def random_store(n, rng):
+    store = entities.new_store()
+    for _ in range(n):
+        entities.spawn(store, rng.randint(-150, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT - 150))
+    return store
+
+
+def rect_hits(store, ship):
+    # the old detect_collisions test, one Rect per object
+    dx, dy, w, h = HITBOX
+    ship_rect = pygame.Rect(ship)
+    hits = []
+    for i, (x, y) in enumerate(entities.positions(store)):
+        if ship_rect.colliderect(pygame.Rect(x + dx, y + dy, w, h)):
+            hits.append(i)
+    return hits
+
+
+def rect_pairs(a, b):
+    dx, dy, w, h = HITBOX
+    rects_b = [pygame.Rect(x + dx, y + dy, w, h) for x, y in entities.positions(b)]
+    found = set()
+    for i, (x, y) in enumerate(entities.positions(a)):
+        for j in pygame.Rect(x + dx, y + dy, w, h).collidelistall(rects_b):
+            found.add((i, j))
+    return found
+
+
+def timed(fn, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        result = fn()
+    return (time.perf_counter() - start) / frames * 1000, result
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = random.Random(0)
+    asteroids, crystals = random_store(n, rng), random_store(n, rng)
+
+    rect_ms, expected = timed(lambda: rect_hits(asteroids, SHIP), frames)
+    sap_ms, hits = timed(lambda: collisions.query(collisions.build(asteroids, *HITBOX), SHIP), frames)
+    assert sorted(hits.tolist()) == expected
+    print(f"{n} objects vs ship: Rect loop {rect_ms:.3f} ms, sweep and prune {sap_ms:.3f} ms, {len(expected)} hits")
+
+    small = 2000
+    a, b = random_store(small, rng), random_store(small, rng)
+    rect_ms, expected = timed(lambda: rect_pairs(a, b), 1)
+    sap_ms, (ia, ib) = timed(lambda: collisions.pairs(collisions.build(a, *HITBOX), collisions.build(b, *HITBOX)), frames)
+    assert set(zip(ia.tolist(), ib.tolist())) == expected
+    print(f"{small} x {small} object pairs: Rect loop {rect_ms:.1f} ms, sweep and prune {sap_ms:.3f} ms, {len(expected)} pairs")
+
+    index = collisions.build(a, *HITBOX)
+    ia, ib = collisions.pairs(index, index)
+    assert (ia != ib).all() and len(set(zip(ia.tolist(), ib.tolist()))) == len(ia)
+    assert {(min(p), max(p)) for p in zip(ia.tolist(), ib.tolist())} == {(i, j) for i, j in rect_pairs(a, a) if i < j}
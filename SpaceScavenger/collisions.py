@@ -0,0 +1,75 @@
+# Sweep-and-prune broadphase for SpaceScavenger.py. Everything scrolls
+# sideways, so the hitboxes of a store are sorted once per frame by their
+# left edge; a query then only looks at the slice whose x range can
+# overlap and finishes with a vectorised y test. Overlap follows
+# pygame.Rect.colliderect: edges that only touch do not collide.
+#
+# build() can fill an index from new_index() instead of a fresh one, which
+# the game does every step so the index arrays are reused. The sort order
+# (argsort has no out=) and a query's slices and masks are still new, short
+# lived arrays each time.
+
+import numpy as np
+
+
+def new_index(capacity=64):
+    return {
+        "buffers": {key: np.zeros(capacity) for key in ("x", "left", "top")},
+        "order": None,
+        "left": None,
+        "top": None,
+        "w": 0,
+        "h": 0,
+    }
+
+
+def build(store, dx, dy, w, h, index=None):
+    # index the hitboxes (x + dx, y + dy, w, h) of every live entity
+    n = store["count"]
+    if index is None:
+        index = new_index(n)
+    buffers = index["buffers"]
+    if len(buffers["x"]) < n:
+        for key in buffers:
+            buffers[key] = np.zeros(len(store["x"]))
+
+    left = np.add(store["x"][:n], dx, out=buffers["x"][:n])
+    order = left.argsort(kind="stable")
+    index["order"] = order
+    index["left"] = left.take(order, out=buffers["left"][:n])
+    index["top"] = store["y"][:n].take(order, out=buffers["top"][:n])
+    index["top"] += dy
+    index["w"], index["h"] = w, h
+    return index
+
+
+def _x_range(index, left, width):
+    # slice of index whose hitboxes overlap [left, left + width) on x
+    lo = index["left"].searchsorted(left - index["w"], side="right")
+    hi = index["left"].searchsorted(left + width, side="left")
+    return lo, np.maximum(hi, lo)
+
+
+def query(index, rect):
+    # store indices whose hitbox overlaps rect = (x, y, w, h)
+    x, y, w, h = rect
+    if w <= 0 or h <= 0 or index["w"] <= 0 or index["h"] <= 0:
+        return index["order"][:0]
+    lo, hi = _x_range(index, x, w)
+    top = index["top"][lo:hi]
+    hit = (top < y + h) & (y < top + index["h"])
+    return index["order"][lo:hi][hit]
+
+
+def pairs(a, b):
+    # (indices into a's store, indices into b's store) of every overlapping
+    # pair. With a is b each pair is reported once and never with itself
+    lo, hi = _x_range(b, a["left"], a["w"])
+    counts = hi - lo
+    ai = np.repeat(np.arange(len(counts)), counts)
+    bj = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - lo, counts)
+
+    hit = (b["top"][bj] < a["top"][ai] + a["h"]) & (a["top"][ai] < b["top"][bj] + b["h"])
+    if a is b:
+        hit &= ai < bj
+    return a["order"][ai[hit]], b["order"][bj[hit]]
@@ -0,0 +1,69 @@
+# Struct-of-arrays store for the asteroids and crystals of SpaceScavenger.py.
+# A store is a dict of parallel NumPy arrays plus a live count; entity i is
+# (store["x"][i], store["y"][i]) for i < store["count"], in (fractional)
+# pixels. The arrays are a pool: spawning fills the next free slot, and
+# removing entities compacts the live ones to the front, so the arrays are
+# only reallocated when a game outgrows the pool (which then doubles).
+# "keep" is scratch space for the removals.
+
+import numpy as np
+
+INITIAL_CAPACITY = 64
+
+
+def new_store(capacity=INITIAL_CAPACITY):
+    return {
+        "x": np.zeros(capacity),
+        "y": np.zeros(capacity),
+        "keep": np.ones(capacity, dtype=bool),
+        "count": 0,
+    }
+
+
+def spawn(store, x, y):
+    n = store["count"]
+    if n == len(store["x"]):
+        for key in ("x", "y", "keep"):
+            grown = np.zeros(2 * n, dtype=store[key].dtype)
+            grown[:n] = store[key]
+            store[key] = grown
+    store["x"][n] = x
+    store["y"][n] = y
+    store["count"] = n + 1
+
+
+def remove_many(store, indices):
+    # drop the entities at indices, keeping the rest in order
+    if not len(indices):
+        return
+    n = store["count"]
+    keep = store["keep"][:n]
+    keep[:] = True
+    keep[indices] = False
+    _compact(store, keep)
+
+
+def move(store, dx):
+    store["x"][:store["count"]] += dx
+
+
+def cull_left_of(store, limit):
+    # drop every entity with x <= limit, keeping the rest in order
+    n = store["count"]
+    keep = np.greater(store["x"][:n], limit, out=store["keep"][:n])
+    if not keep.all():
+        _compact(store, keep)
+
+
+def _compact(store, keep):
+    n = store["count"]
+    kept = int(np.count_nonzero(keep))
+    for key in ("x", "y"):
+        store[key][:kept] = store[key][:n][keep]
+    store["count"] = kept
+
+
+def positions(store):
+    # live (x, y) pairs as Python floats, for drawing; two new lists a call
+    n = store["count"]
+    return zip(store["x"][:n].tolist(), store["y"][:n].tolist())
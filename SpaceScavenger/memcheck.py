@@ -0,0 +1,100 @@
+# Plays SpaceScavenger headless under tracemalloc after a warm-up, two logic
+# steps and one draw per frame, with life and crystals topped up so the game
+# never ends. It fails if memory grows from the first half of the run to the
+# second, if an entity pool has to grow, or if the garbage collector runs.
+#
+#   python memcheck.py [frames]
+#
+# This is no net growth, not zero allocation. NumPy still makes short-lived
+# temporaries every step (the argsort order, the query slices and masks),
+# and drawing builds each store's position lists. They are freed within the
+# frame; the script reports them as the transient bytes per frame, and the
+# blocks still alive per frame by file from a snapshot diff of the two halves.
+
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from collections import defaultdict
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+import SpaceScavenger as game
+import scene
+
+WARMUP = 1000
+# the index arrays alive at the end differ in length from those at the
+# halfway point, and CPython's free lists hold on to some of the frame's
+# short-lived lists and tuples, which tracemalloc still counts. Neither
+# scales with frames, so allow that much
+SLACK = 16384
+STEPS_PER_FRAME = 2  # LOGIC_HZ at 60 FPS
+
+
+def setup():
+    # what main() sets up for draw_objects, with plain surfaces for images
+    pygame.init()
+    screen = pygame.display.set_mode((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    game.SPACESHIP_IMG = game.ASTEROID_IMG = pygame.Surface((game.INITIAL_SIZE, game.INITIAL_SIZE))
+    game.CRYSTAL_SPRITE = game.labelled(pygame.Surface((game.INITIAL_SIZE, game.INITIAL_SIZE)), "+ 5", (65, 30))
+    game.SCENE = scene.new_scene((game.SCREEN_WIDTH, game.SCREEN_HEIGHT), game.BLACK)
+    return screen
+
+
+def keep_alive():
+    game.GAME["life_points"] = 100
+    game.GAME["crystal_points"] = 0
+    game.GAME["timer"] = 0
+
+
+def run(frames, keys, screen, transient=None):
+    for frame in range(frames):
+        if transient is not None:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        for _ in range(STEPS_PER_FRAME):
+            game.update(keys)
+            keep_alive()
+        game.draw_objects(0.5)
+        scene.draw(game.SCENE, screen)
+        if transient is not None:
+            transient[frame] = tracemalloc.get_traced_memory()[1] - before
+
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    random.seed(0)
+    screen = setup()
+    game.GAME = game.reset_game()
+    keys = defaultdict(bool)
+    run(WARMUP, keys, screen)
+    capacity = {name: len(game.GAME[name]["x"]) for name in ("asteroids", "crystals")}
+
+    measured = frames - frames // 2
+    collections = []
+    transient = np.zeros(measured, dtype=np.int64)  # a list would keep an int object per frame
+    tracemalloc.start()
+    run(frames // 2, keys, screen)
+    first = tracemalloc.take_snapshot()
+    gc.collect()
+    gc.callbacks.append(lambda phase, info: phase == "start" and collections.append(info["generation"]))
+    before = tracemalloc.get_traced_memory()[0]
+    run(measured, keys, screen, transient)
+    after = tracemalloc.get_traced_memory()[0]
+    gc.callbacks.clear()  # taking the snapshot runs the collector
+    second = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    for stat in second.compare_to(first, "filename")[:5]:
+        if stat.count_diff:
+            print(f"  {stat.traceback[0].filename}: {stat.count_diff / measured:+.3f} blocks, "
+                  f"{stat.size_diff / measured:+.1f} bytes per frame")
+    grown = {name: len(game.GAME[name]["x"]) for name in capacity} != capacity
+    print(f"{frames} frames: {after - before} bytes of growth, "
+          f"{transient.mean():.0f} bytes transient per frame (max {transient.max()}), "
+          f"{len(collections)} gc runs, pools grown: {grown}")
+    assert not grown and not collections and after - before <= SLACK
@@ -0,0 +1,112 @@
+# Per-phase frame profiler for SpaceScavenger.py. The main loop calls
+# mark(phase) right after each phase; the time since the previous mark goes
+# to that phase (added up when a phase runs several times in one frame, like
+# the logic steps), and end_frame() closes the frame. While running it keeps
+# the last WINDOW frames for the overlay's rolling average / p99, and can
+# write every frame to a CSV file in nanoseconds.
+#
+# Stopped, mark() and end_frame() return on their first line.
+
+import csv
+from collections import deque
+from time import perf_counter_ns
+
+import pygame
+
+WINDOW = 240  # frames in the rolling stats
+REFRESH = 30  # frames between overlay text updates
+OVERLAY_BG = (0, 0, 0, 170)
+OVERLAY_FG = (200, 255, 200)
+
+_state = {"on": False, "phases": (), "frame": None, "last": 0, "frames": 0,
+          "csv": None, "writer": None, "panel": None, "shown": -REFRESH}
+_history = {}
+
+
+def start(phases, csv_path=None):
+    _state["phases"] = tuple(phases)
+    _state["frame"] = dict.fromkeys(_state["phases"], 0)
+    _state["frames"] = 0
+    _state["shown"] = -REFRESH
+    _state["panel"] = None
+    _history.clear()
+    for phase in _state["phases"]:
+        _history[phase] = deque(maxlen=WINDOW)
+    if csv_path:
+        _state["csv"] = open(csv_path, "w", newline="")
+        _state["writer"] = csv.writer(_state["csv"])
+        _state["writer"].writerow(("frame",) + _state["phases"] + ("total",))
+    _state["last"] = perf_counter_ns()
+    _state["on"] = True
+
+
+def stop():
+    _state["on"] = False
+    if _state["csv"]:
+        _state["csv"].close()
+        _state["csv"] = _state["writer"] = None
+
+
+def toggle(phases):
+    if _state["on"]:
+        stop()
+    else:
+        start(phases)
+
+
+def running():
+    return _state["on"]
+
+
+def mark(phase):
+    if not _state["on"]:
+        return
+    now = perf_counter_ns()
+    _state["frame"][phase] += now - _state["last"]
+    _state["last"] = now
+
+
+def end_frame():
+    if not _state["on"]:
+        return
+    frame = _state["frame"]
+    for phase, ns in frame.items():
+        _history[phase].append(ns)
+    if _state["writer"]:
+        _state["writer"].writerow([_state["frames"]] + list(frame.values()) + [sum(frame.values())])
+    _state["frame"] = dict.fromkeys(_state["phases"], 0)
+    _state["frames"] += 1
+
+
+def summary():
+    # {phase: (average ms, p99 ms)} over the last WINDOW frames
+    result = {}
+    for phase, times in _history.items():
+        if times:
+            ordered = sorted(times)
+            p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+            result[phase] = (sum(ordered) / len(ordered) / 1e6, p99 / 1e6)
+    return result
+
+
+def panel(font, render):
+    # the overlay surface; render(text, font, color) is textcache.render.
+    # It is rebuilt every REFRESH frames and the same surface returned in between
+    if _state["frames"] - _state["shown"] >= REFRESH or _state["panel"] is None:
+        stats = summary()
+        lines = [f"{'phase':<26}{'avg':>7}{'p99':>7}"]
+        lines += [f"{phase:<26}{avg:>7.2f}{p99:>7.2f}" for phase, (avg, p99) in stats.items()]
+        total = sum(avg for avg, _ in stats.values())
+        lines.append(f"{'frame (ms)':<26}{total:>7.2f}")
+
+        texts = [render(line, font, OVERLAY_FG) for line in lines]
+        surface = pygame.Surface((max(t.get_width() for t in texts) + 10,
+                                  sum(t.get_height() for t in texts) + 10), pygame.SRCALPHA)
+        surface.fill(OVERLAY_BG)
+        y = 5
+        for text in texts:
+            surface.blit(text, (5, y))
+            y += text.get_height()
+        _state["panel"] = surface
+        _state["shown"] = _state["frames"]
+    return _state["panel"]
@@ -0,0 +1,72 @@
+# Dirty-rect drawing for SpaceScavenger.py. Everything on screen is a
+# DirtySprite in one pygame.sprite.LayeredDirty group; a sprite is only
+# marked dirty when its image or position changes, and draw() returns just
+# the rects that changed for pygame.display.update.
+#
+# Entities are drawn through pools of sprites: sync() places one sprite per
+# live entity and hides the rest, so sprites are only created when a pool
+# grows.
+
+import pygame
+
+# layers, bottom to top
+SHIP, ASTEROIDS, CRYSTALS, HUD, MESSAGE, OVERLAY = range(6)
+
+
+def new_scene(size, color):
+    background = pygame.Surface(size).convert()
+    background.fill(color)
+    group = pygame.sprite.LayeredDirty()
+    group.clear(pygame.display.get_surface(), background)
+    return {"group": group, "pools": {}, "sprites": {}}
+
+
+def sprite(scene, name, layer):
+    # the single sprite called name, created hidden on first use
+    if name not in scene["sprites"]:
+        s = pygame.sprite.DirtySprite()
+        s.image = pygame.Surface((0, 0))
+        s.rect = pygame.Rect(0, 0, 0, 0)
+        s.visible = 0
+        scene["group"].add(s, layer=layer)
+        scene["sprites"][name] = s
+    return scene["sprites"][name]
+
+
+def place(s, image, x, y):
+    x, y = int(x), int(y)
+    if s.image is not image:
+        s.image = image
+        s.rect.size = image.get_size()
+        s.dirty = 1
+    if s.rect.x != x or s.rect.y != y:
+        s.rect.topleft = x, y
+        s.dirty = 1
+    s.visible = 1  # marks the sprite dirty if it was hidden
+
+
+def hide(s):
+    s.visible = 0
+
+
+def sync(scene, layer, image, positions, dx=0):
+    # one visible sprite per (x + dx, y) in positions on this layer
+    pool = scene["pools"].get(layer)
+    if pool is None:
+        pool = scene["pools"][layer] = []
+    used = 0
+    for x, y in positions:
+        if used == len(pool):
+            s = pygame.sprite.DirtySprite()
+            s.rect = pygame.Rect(0, 0, 0, 0)
+            s.image = None
+            scene["group"].add(s, layer=layer)
+            pool.append(s)
+        place(pool[used], image, x + dx, y)
+        used += 1
+    for s in pool[used:]:
+        s.visible = 0
+
+
+def draw(scene, surface):
+    return scene["group"].draw(surface)
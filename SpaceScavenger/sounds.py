@@ -0,0 +1,91 @@
+# Sound effects for SpaceScavenger.py. Each effect is decoded into memory
+# once by load() and gets a fixed budget of reserved mixer channels, so a
+# burst of one effect can never take the channels of another. A play within
+# repeat_ms of the previous one is dropped, and when all of an effect's
+# channels are busy the one that started first is cut off.
+#
+# Without an audio device init() returns False and every call is a no-op;
+# the SDL dummy driver (SDL_AUDIODRIVER=dummy) works like a real device.
+
+import os
+
+import pygame
+
+_effects = {}
+_stats = {"played": 0, "throttled": 0, "cut": 0}
+_state = {"enabled": False, "reserved": 0}
+
+
+def init():
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            _state["enabled"] = False
+            return False
+    _state["enabled"] = True
+    return True
+
+
+def load(name, path, channels=2, repeat_ms=60, volume=1.0):
+    if not _state["enabled"]:
+        return
+    sound = pygame.mixer.Sound(path)
+    sound.set_volume(volume)
+
+    first = _state["reserved"]
+    _state["reserved"] += channels
+    if pygame.mixer.get_num_channels() < _state["reserved"]:
+        pygame.mixer.set_num_channels(_state["reserved"])
+    # reserved channels are never picked by a plain Sound.play()
+    pygame.mixer.set_reserved(_state["reserved"])
+
+    _effects[name] = {
+        "sound": sound,
+        "channels": [pygame.mixer.Channel(i) for i in range(first, first + channels)],
+        "next": 0,
+        "repeat_ms": repeat_ms,
+        "last_ms": None,
+    }
+
+
+def play(name):
+    # effects that were never loaded (headless runs) are ignored
+    effect = _effects.get(name)
+    if effect is None:
+        return False
+
+    now = pygame.time.get_ticks()
+    if effect["last_ms"] is not None and now - effect["last_ms"] < effect["repeat_ms"]:
+        _stats["throttled"] += 1
+        return False
+    effect["last_ms"] = now
+
+    for channel in effect["channels"]:
+        if not channel.get_busy():
+            break
+    else:
+        # all busy: cut the channel that started first
+        channel = effect["channels"][effect["next"]]
+        _stats["cut"] += 1
+    effect["next"] = (effect["channels"].index(channel) + 1) % len(effect["channels"])
+
+    channel.play(effect["sound"])
+    _stats["played"] += 1
+    return True
+
+
+def music(path, loops=-1):
+    # streams background music; a missing file just means no music
+    if not _state["enabled"] or not os.path.exists(path):
+        return False
+    try:
+        pygame.mixer.music.load(path)
+    except pygame.error:
+        return False
+    pygame.mixer.music.play(loops)
+    return True
+
+
+def stats():
+    return dict(_stats)
@@ -0,0 +1,161 @@
+# Startup image loading shared by the games. Each image is loaded and
+# transformed once, and the result is kept on disk as raw RGBA pixels, keyed
+# by the source file's mtime and size and by the transforms, so a warm start
+# skips the PNG decode and the scaling. preload() does the file work on
+# background threads while the window comes up; finish() waits for it and
+# converts every surface to the display format, which needs the window.
+#
+#   python assets.py [repeats]   # cold vs warm load times of the games' images
+
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+CACHE_DIR = os.environ.get("ASSET_CACHE",
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), ".assetcache"))
+WORKERS = 2
+
+# transforms are (name, argument) pairs applied in order
+TRANSFORMS = {
+    "scale": pygame.transform.scale,
+    "smoothscale": pygame.transform.smoothscale,
+    "rotate": pygame.transform.rotate,
+}
+
+# cache file: magic, width, height, then width * height RGBA pixels
+HEADER = struct.Struct("<4sII")
+MAGIC = b"IMG1"
+
+_stats = {"cached": 0, "built": 0}
+_lock = threading.Lock()
+
+
+def cache_path(path, transforms=()):
+    st = os.stat(path)
+    key = repr((os.path.abspath(path), st.st_mtime_ns, st.st_size, tuple(transforms)))
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".rgba")
+
+
+def _read(cache):
+    try:
+        with open(cache, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, w, h = HEADER.unpack_from(data)
+    if magic != MAGIC or len(data) != HEADER.size + 4 * w * h:
+        return None
+    return pygame.image.frombytes(data[HEADER.size:], (w, h), "RGBA")
+
+
+def _write(cache, surf):
+    # written under a temporary name first, so a half-written file is never read
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{cache}.{os.getpid()}.{threading.get_ident()}"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, *surf.get_size()))
+        f.write(pygame.image.tobytes(surf, "RGBA"))
+    os.replace(tmp, cache)
+
+
+def build(path, transforms=()):
+    # the transformed image, from the disk cache while the source is unchanged.
+    # Safe to call from any thread; the result is not display-converted yet
+    cache = cache_path(path, transforms)
+    surf = _read(cache)
+    if surf is not None:
+        with _lock:
+            _stats["cached"] += 1
+        return surf
+
+    surf = pygame.image.load(path)
+    for name, arg in transforms:
+        surf = TRANSFORMS[name](surf, arg)
+    try:
+        _write(cache, surf)
+    except OSError:
+        pass  # a read-only checkout only loses the cache
+    with _lock:
+        _stats["built"] += 1
+    return surf
+
+
+def preload(specs):
+    # specs is {name: (path, transforms)}; starts building them all and
+    # returns right away. Call it before pygame.display.set_mode
+    pool = ThreadPoolExecutor(max_workers=WORKERS)
+    pending = {name: pool.submit(build, path, tuple(transforms)) for name, (path, transforms) in specs.items()}
+    pool.shutdown(wait=False)
+    return pending
+
+
+def finish(pending):
+    # {name: surface} in the display format, once preload() is done
+    return {name: future.result().convert_alpha() for name, future in pending.items()}
+
+
+def load(specs):
+    return finish(preload(specs))
+
+
+def stats():
+    with _lock:
+        return dict(_stats)
+
+
+def clear():
+    # drops the disk cache
+    if os.path.isdir(CACHE_DIR):
+        for name in os.listdir(CACHE_DIR):
+            os.remove(os.path.join(CACHE_DIR, name))
+    with _lock:
+        _stats["cached"] = _stats["built"] = 0
+
+
+# ---------------- COLD VS WARM ----------------
+# the images the games preload at startup (keep in step with them), relative
+# to each game's directory
+GAME_ASSETS = {
+    "CandCrush": {
+        f"bon bon {i}": (f"assets/bon bon {i}.png", [("smoothscale", (56, 56))]) for i in range(1, 5)
+    },
+    "SpaceScavenger": {
+        "icon": ("assets/images/spaceship.png", []),
+        "spaceship": ("assets/images/spaceship.png", [("scale", (70, 70))]),
+        "asteroid": ("assets/images/asteroid.png", [("rotate", -45), ("scale", (70, 70))]),
+        "crystal": ("assets/images/energy_crystal.png", [("scale", (70, 70))]),
+        "crystal icon": ("assets/images/energy_crystal.png", [("scale", (70, 70)), ("scale", (45, 45))]),
+    },
+}
+
+
+def _timed_load(specs):
+    start = time.perf_counter()
+    load(specs)
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    root = os.path.dirname(os.path.abspath(__file__))
+    CACHE_DIR = tempfile.mkdtemp()  # leave the real cache alone
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    for game, specs in GAME_ASSETS.items():
+        specs = {name: (os.path.join(root, game, path), transforms) for name, (path, transforms) in specs.items()}
+        cold, warm = [], []
+        for _ in range(repeats):
+            clear()
+            cold.append(_timed_load(specs))
+            warm.append(_timed_load(specs))
+        print(f"{game}: {len(specs)} images, cold {min(cold):.1f} ms, warm {min(warm):.1f} ms (best of {repeats})")
@@ -6,6 +6,8 @@
 import random, pygame, sys
 from pygame.locals import *
 
+import textcache
+
 FPS = 30 # frames per second, the general speed of the program
 WINDOWWIDTH = 700 # size of window's width in pixels
 WINDOWHEIGHT = 700 # size of windows' height in pixels
@@ -17,6 +19,9 @@ BOARDHEIGHT = 10 # number of rows of icons
 assert (BOARDWIDTH * BOARDHEIGHT) % 2 == 0, 'Board needs to have an even number of boxes for pairs of matches.'
 XMARGIN = int((WINDOWWIDTH - (BOARDWIDTH * (BOXSIZE + GAPSIZE))) / 2)
 YMARGIN = int((WINDOWHEIGHT - (BOARDHEIGHT * (BOXSIZE + GAPSIZE))) / 2)
+REVEALTIME = 1000 * BOXSIZE // (REVEALSPEED * FPS) # milliseconds for a box to be revealed or covered
+HINTTIME = 700 # milliseconds a hint stays on the screen
+FLASHTIME = 300 # milliseconds between background color swaps when the player has won
 
 #            R    G    B
 GRAY     = (100, 100, 100)
@@ -36,6 +41,8 @@ BGCOLOR = NAVYBLUE
 LIGHTBGCOLOR = GRAY
 BOXCOLOR = WHITE
 HIGHLIGHTCOLOR = BLUE
+HINTCOLOR = YELLOW
+ATLASKEYCOLOR = (0, 0, 0) # the see-through color of the icon atlas, in none of the icons
 
 DONUT = 'donut'
 SQUARE = 'square'
@@ -44,16 +51,34 @@ LINES = 'lines'
 OVAL = 'oval'
 TRIANGLE = 'triangle'
 
+# animation kinds, see animate()
+REVEAL = 'reveal'
+COVER = 'cover'
+HINT = 'hint'
+FLASH = 'flash'
+WAIT = 'wait'
+HIGHLIGHT = 'highlight' # the frame of the box under the mouse
+
 
 ALLCOLORS = (RED, GREEN, BLUE, YELLOW, ORANGE, PURPLE, CYAN, PINK, BURGUNDY)
 ALLSHAPES = (DONUT, SQUARE, DIAMOND, LINES, OVAL, TRIANGLE)
 assert len(ALLCOLORS) * len(ALLSHAPES) * 4 > BOARDWIDTH * BOARDHEIGHT, "Board is too big for the number of shapes/colors defined."
 
+# Where each (shape, color) icon is in the icon atlas (see makeIconAtlas()):
+# a column for each shape and a row for each color, and after the last
+# shape, a box cover.
+ICONRECTS = {}
+for row, color in enumerate(ALLCOLORS):
+    for column, shape in enumerate(ALLSHAPES):
+        ICONRECTS[(shape, color)] = pygame.Rect(column * BOXSIZE, row * BOXSIZE, BOXSIZE, BOXSIZE)
+COVERRECT = pygame.Rect(len(ALLSHAPES) * BOXSIZE, 0, BOXSIZE, BOXSIZE)
+
 def main():
-    global FPSCLOCK, DISPLAYSURF
+    global FPSCLOCK, DISPLAYSURF, ICONATLAS
     pygame.init()
     FPSCLOCK = pygame.time.Clock()
     DISPLAYSURF = pygame.display.set_mode((WINDOWWIDTH, WINDOWHEIGHT))
+    ICONATLAS = makeIconAtlas()
     # ADDED-------------------------------------------------------------
     pygame.display.set_caption("Memory Puzzle")
     mousex = 0 # used to store x coordinate of mouse event
@@ -65,35 +90,38 @@ def main():
 
     firstSelection = None # stores the (x, y) of the first box clicked.
 
-    DISPLAYSURF.fill(BGCOLOR)
-    startGameAnimation(mainBoard)
+    startGameAnimation(pygame.time.get_ticks())
     # ADDED------------------------------------------------------------------------
     hintButtonRect = pygame.Rect(WINDOWWIDTH - 120, 20, 100, 40)
 
     # ✅ Score sistemi
     score = 0
     combo = 0   # колку пати по ред погодил точно
-    font = pygame.font.Font(None, 36)
+    font = textcache.font(30)
     # --------------------------------------------------------------------------------
 
-    while True: # main game loop
-        mouseClicked = False
+    # What is on the screen: only the boxes that look different from the last
+    # frame are drawn again, unless drawnLooks is None or the score or the
+    # background color changed, which redraws the whole window.
+    drawnLooks = None
+    drawnScore = None
+    drawnBgColor = None
 
-        DISPLAYSURF.fill(BGCOLOR) # drawing the window
-        #aADDED hint button -----------------------------------------------------------------------------------
-        pygame.draw.rect(DISPLAYSURF, (255, 255, 0), hintButtonRect)
-        font = pygame.font.Font(None, 30)
-        textSurf = font.render('HINT', True, (0, 0, 0))
-        textRect = textSurf.get_rect(center=hintButtonRect.center)
-        # -------------------------------------------------------------------------------------------------
+    def startNewGame():
+        # Called when the game won animation is over.
+        nonlocal mainBoard, revealedBoxes, drawnLooks
+        mainBoard = getRandomizedBoard()
+        revealedBoxes = generateRevealedBoxesData(False)
+        drawnLooks = None
 
-        # ADDED--✅ Прикажи тековни поени ------------------------------------------------------------------------
-        score_text = font.render(f"Score: {score}", True, WHITE)
-        DISPLAYSURF.blit(score_text, (20, 20))
-        # ------------------------------------------------------------------------------
+        # Show the fully unrevealed board for a second, then replay the
+        # start game animation.
+        startGameAnimation(pygame.time.get_ticks() + 1000)
 
-        DISPLAYSURF.blit(textSurf, textRect)
-        drawBoard(mainBoard, revealedBoxes)
+    while True: # main game loop
+        mouseClicked = False
+        now = pygame.time.get_ticks()
+        runAnimations(now)
 
         for event in pygame.event.get(): # event handling loop
             if event.type == QUIT or (event.type == KEYUP and event.key == K_ESCAPE):
@@ -107,13 +135,14 @@ def main():
                     if hintButtonRect.collidepoint((mousex, mousey)):
                         showHint(mainBoard, revealedBoxes, firstSelection)
 
+        mouseBox = None
         boxx, boxy = getBoxAtPixel(mousex, mousey)
-        if boxx != None and boxy != None:
-            # The mouse is currently over a box.
-            if not revealedBoxes[boxx][boxy]:
-                drawHighlightBox(boxx, boxy)
-            if not revealedBoxes[boxx][boxy] and mouseClicked:
-                revealBoxesAnimation(mainBoard, [(boxx, boxy)])
+        if boxx != None and boxy != None and not revealedBoxes[boxx][boxy] and not isAnimating((boxx, boxy)):
+            # The mouse is currently over a box that can be clicked.
+            mouseBox = (boxx, boxy)
+            if mouseClicked:
+                mouseBox = None
+                revealEnd = revealBoxesAnimation([(boxx, boxy)], now)
                 revealedBoxes[boxx][boxy] = True # set the box as "revealed"
                 if firstSelection == None: # the current box was the first box clicked
                     firstSelection = (boxx, boxy)
@@ -127,9 +156,9 @@ def main():
                     icon2shape, icon2color = getShapeAndColor(mainBoard, boxx, boxy)
 
                     if icon1shape != icon2shape or icon1color != icon2color:
-                        # Icons don't match. Re-cover up both selections.
-                        pygame.time.wait(1000) # 1000 milliseconds = 1 sec
-                        coverBoxesAnimation(mainBoard, [(firstSelection[0], firstSelection[1]), (boxx, boxy)])
+                        # Icons don't match. Re-cover up both selections a
+                        # second after this one is revealed.
+                        coverBoxesAnimation([(firstSelection[0], firstSelection[1]), (boxx, boxy)], revealEnd + 1000)
                         revealedBoxes[firstSelection[0]][firstSelection[1]] = False
                         revealedBoxes[boxx][boxy] = False
                         combo=0
@@ -144,26 +173,37 @@ def main():
                         #     -----------------------------------------------------------
 
                     if hasWon(revealedBoxes): # check if all pairs found
-                        gameWonAnimation(mainBoard)
-                        pygame.time.wait(2000)
-
-                        # Reset the board
-                        mainBoard = getRandomizedBoard()
-                        revealedBoxes = generateRevealedBoxesData(False)
-
-                        # Show the fully unrevealed board for a second.
-                        drawBoard(mainBoard, revealedBoxes)
-                        pygame.display.update()
-                        pygame.time.wait(1000)
-
-
-
-                        # Replay the start game animation.
-                        startGameAnimation(mainBoard)
+                        # Flash, wait two seconds and reset the board.
+                        wonEnd = gameWonAnimation(revealEnd)
+                        animate(WAIT, [], wonEnd, 2000, startNewGame)
                     firstSelection = None # reset firstSelection variable
 
-        # Redraw the screen and wait a clock tick.
-        pygame.display.update()
+        # Redraw what changed and wait a clock tick.
+        bgColor = getBackgroundColor(now)
+        looks = getBoxLooks(revealedBoxes, mouseBox, now)
+        if drawnLooks is None or score != drawnScore or bgColor != drawnBgColor:
+            DISPLAYSURF.fill(bgColor) # drawing the window
+            #aADDED hint button -----------------------------------------------------------------------------------
+            pygame.draw.rect(DISPLAYSURF, (255, 255, 0), hintButtonRect)
+            textSurf = textcache.render('HINT', font, (0, 0, 0))
+            textRect = textSurf.get_rect(center=hintButtonRect.center)
+            # -------------------------------------------------------------------------------------------------
+
+            # ADDED--✅ Прикажи тековни поени ------------------------------------------------------------------------
+            score_text = textcache.render(f"Score: {score}", font, WHITE)
+            DISPLAYSURF.blit(score_text, (20, 20))
+            # ------------------------------------------------------------------------------
+
+            DISPLAYSURF.blit(textSurf, textRect)
+            drawBoard(mainBoard, looks, bgColor)
+            pygame.display.update()
+        else:
+            changedRects = []
+            for box, look in looks.items():
+                if look != drawnLooks[box]:
+                    changedRects.append(drawBox(mainBoard, box, look, bgColor))
+            pygame.display.update(changedRects)
+        drawnLooks, drawnScore, drawnBgColor = looks, score, bgColor
         FPSCLOCK.tick(FPS)
 
 
@@ -174,17 +214,12 @@ def generateRevealedBoxesData(val):
     return revealedBoxes
 
 def drawText(text, size, color, x, y):
-    font = pygame.font.SysFont(None, size)
-    surf = font.render(text, True, color)
+    surf = textcache.render(text, textcache.font(size, system=True), color)
     DISPLAYSURF.blit(surf, (x, y))
 
 # ADDED----------------------------------------------------------------------------------
 def highlightBoxTemporarily(x, y):
-    left, top = leftTopCoordsOfBox(x, y)
-    pygame.draw.rect(DISPLAYSURF, (255, 255, 0), (left - 5, top - 5, BOXSIZE + 10, BOXSIZE + 10), 5)
-    pygame.display.update()
-    pygame.time.wait(700)
-    pygame.display.update()
+    animate(HINT, [(x, y)], pygame.time.get_ticks(), HINTTIME)
 
 def showHint(mainBoard, revealedBoxes, firstSelection):
     # Eğer hiç kutu açılmadıysa, ipucu verme
@@ -244,37 +279,64 @@ def leftTopCoordsOfBox(boxx, boxy):
     return (left, top)
 
 
-def getBoxAtPixel(x, y):
-    for boxx in range(BOARDWIDTH):
-        for boxy in range(BOARDHEIGHT):
-            left, top = leftTopCoordsOfBox(boxx, boxy)
-            boxRect = pygame.Rect(left, top, BOXSIZE, BOXSIZE)
-            if boxRect.collidepoint(x, y):
-                return (boxx, boxy)
-    return (None, None)
-
+# (x, y) of the last getBoxAtPixel() call and its answer. The main loop asks
+# every frame, and most frames the mouse has not moved.
+lastBoxAtPixel = [None, (None, None)]
 
-def drawIcon(shape, color, boxx, boxy):
+def getBoxAtPixel(x, y):
+    # The boxes sit on a grid of BOXSIZE + GAPSIZE cells, so the box under a
+    # pixel comes from dividing by the cell size; the last GAPSIZE pixels of
+    # a cell are the gap, which is not in any box.
+    if lastBoxAtPixel[0] == (x, y):
+        return lastBoxAtPixel[1]
+    boxx, offsetx = divmod(x - XMARGIN, BOXSIZE + GAPSIZE)
+    boxy, offsety = divmod(y - YMARGIN, BOXSIZE + GAPSIZE)
+    if 0 <= boxx < BOARDWIDTH and 0 <= boxy < BOARDHEIGHT and offsetx < BOXSIZE and offsety < BOXSIZE:
+        box = (boxx, boxy)
+    else:
+        box = (None, None)
+    lastBoxAtPixel[:] = [(x, y), box]
+    return box
+
+
+def drawIconShape(surface, shape, color, left, top):
     quarter = int(BOXSIZE * 0.25) # syntactic sugar
     half =    int(BOXSIZE * 0.5)  # syntactic sugar
 
-    left, top = leftTopCoordsOfBox(boxx, boxy) # get pixel coords from board coords
     # Draw the shapes
     if shape == DONUT:
-        pygame.draw.circle(DISPLAYSURF, color, (left + half, top + half), half - 5)
-        pygame.draw.circle(DISPLAYSURF, BGCOLOR, (left + half, top + half), quarter - 5)
+        pygame.draw.circle(surface, color, (left + half, top + half), half - 5)
+        pygame.draw.circle(surface, BGCOLOR, (left + half, top + half), quarter - 5)
     elif shape == SQUARE:
-        pygame.draw.rect(DISPLAYSURF, color, (left + quarter, top + quarter, BOXSIZE - half, BOXSIZE - half))
+        pygame.draw.rect(surface, color, (left + quarter, top + quarter, BOXSIZE - half, BOXSIZE - half))
     elif shape == DIAMOND:
-        pygame.draw.polygon(DISPLAYSURF, color, ((left + half, top), (left + BOXSIZE - 1, top + half), (left + half, top + BOXSIZE - 1), (left, top + half)))
+        pygame.draw.polygon(surface, color, ((left + half, top), (left + BOXSIZE - 1, top + half), (left + half, top + BOXSIZE - 1), (left, top + half)))
     elif shape == LINES:
         for i in range(0, BOXSIZE, 4):
-            pygame.draw.line(DISPLAYSURF, color, (left, top + i), (left + i, top))
-            pygame.draw.line(DISPLAYSURF, color, (left + i, top + BOXSIZE - 1), (left + BOXSIZE - 1, top + i))
+            pygame.draw.line(surface, color, (left, top + i), (left + i, top))
+            pygame.draw.line(surface, color, (left + i, top + BOXSIZE - 1), (left + BOXSIZE - 1, top + i))
     elif shape == OVAL:
-        pygame.draw.ellipse(DISPLAYSURF, color, (left, top + quarter, BOXSIZE, half))
+        pygame.draw.ellipse(surface, color, (left, top + quarter, BOXSIZE, half))
     elif shape == TRIANGLE:
-        pygame.draw.ellipse(DISPLAYSURF, color, (left, top + quarter, BOXSIZE, half))
+        pygame.draw.ellipse(surface, color, (left, top + quarter, BOXSIZE, half))
+
+
+def makeIconAtlas():
+    # Draws every icon once, where ICONRECTS says, so drawing one is a blit
+    # instead of up to 20 draw calls. Needs the display to be set up.
+    width = (len(ALLSHAPES) + 1) * BOXSIZE
+    atlas = pygame.Surface((width, len(ALLCOLORS) * BOXSIZE)).convert()
+    atlas.fill(ATLASKEYCOLOR)
+    atlas.set_colorkey(ATLASKEYCOLOR)
+    for (shape, color), rect in ICONRECTS.items():
+        drawIconShape(atlas, shape, color, rect.left, rect.top)
+    atlas.fill(BOXCOLOR, COVERRECT)
+    return atlas
+
+
+def drawIcon(shape, color, boxx, boxy):
+    left, top = leftTopCoordsOfBox(boxx, boxy) # get pixel coords from board coords
+    DISPLAYSURF.blit(ICONATLAS, (left, top), ICONRECTS[(shape, color)])
 
 
 def getShapeAndColor(board, boxx, boxy):
@@ -283,54 +345,128 @@ def getShapeAndColor(board, boxx, boxy):
     return board[boxx][boxy][0], board[boxx][boxy][1]
 
 
-def drawBoxCovers(board, boxes, coverage):
-    # Draws boxes being covered/revealed. "boxes" is a list
-    # of two-item lists, which have the x & y spot of the box.
-    for box in boxes:
-        left, top = leftTopCoordsOfBox(box[0], box[1])
-        pygame.draw.rect(DISPLAYSURF, BGCOLOR, (left, top, BOXSIZE, BOXSIZE))
+# Animations are not drawn by loops of their own: animate() adds one to
+# this list, and the main loop draws every box as the animations say it
+# looks at that moment (see getBoxLooks()). Any number of them can run at
+# once, and the game keeps handling input while they do.
+animations = []
+
+def animate(kind, boxes, start, duration, onDone=None):
+    # Schedules an animation of the boxes from `start` (in milliseconds of
+    # pygame.time.get_ticks()) for `duration` milliseconds. REVEAL and COVER
+    # slide the boxes' covers, HINT frames them, FLASH swaps the background
+    # color and WAIT does nothing. onDone is called once it is over.
+    # Returns the time it ends at.
+    animations.append({'kind': kind, 'boxes': boxes, 'start': start, 'end': start + duration, 'onDone': onDone})
+    return start + duration
+
+
+def runAnimations(now):
+    # Drops the animations that are over and calls their onDone.
+    for anim in [anim for anim in animations if anim['end'] <= now]:
+        animations.remove(anim)
+        if anim['onDone'] is not None:
+            anim['onDone']()
+
+
+def isAnimating(box):
+    # True if the box is being (or waiting to be) revealed or covered.
+    for anim in animations:
+        if anim['kind'] in (REVEAL, COVER) and box in anim['boxes']:
+            return True
+    return False
+
+
+def getBackgroundColor(now):
+    for anim in animations:
+        if anim['kind'] == FLASH and anim['start'] <= now and (now - anim['start']) // FLASHTIME % 2:
+            return LIGHTBGCOLOR
+    return BGCOLOR
+
+
+def getBoxLooks(revealed, mouseBox, now):
+    # Returns how every box looks at `now`, as {(x, y): (coverage, frame)}.
+    # coverage is how many pixels of the box the cover is over, from 0 for a
+    # revealed box to BOXSIZE for a covered one; frame is HINT, HIGHLIGHT or
+    # None. A box waiting for an animation looks as it does when that starts.
+    coverages = {}
+    hinted = set()
+    for anim in sorted(animations, key=lambda anim: anim['start']):
+        started = anim['start'] <= now
+        if anim['kind'] == HINT and started:
+            hinted.update(anim['boxes'])
+        if anim['kind'] not in (REVEAL, COVER):
+            continue
+        progress = min(max(now - anim['start'], 0) / (anim['end'] - anim['start']), 1)
+        coverage = int(BOXSIZE * progress)
+        if anim['kind'] == REVEAL:
+            coverage = BOXSIZE - coverage
+        for box in anim['boxes']:
+            if started or box not in coverages:
+                coverages[box] = coverage
+
+    looks = {}
+    for boxx in range(BOARDWIDTH):
+        for boxy in range(BOARDHEIGHT):
+            box = (boxx, boxy)
+            coverage = coverages.get(box, 0 if revealed[boxx][boxy] else BOXSIZE)
+            if box in hinted:
+                frame = HINT
+            elif box == mouseBox:
+                frame = HIGHLIGHT
+            else:
+                frame = None
+            looks[box] = (coverage, frame)
+    return looks
+
+
+def drawBox(board, box, look, bgColor):
+    # Draws a box as it looks (see getBoxLooks()), and returns the rect drawn
+    # over: the box and the gap around it, where the frame goes.
+    coverage, frame = look
+    left, top = leftTopCoordsOfBox(box[0], box[1])
+    area = pygame.Rect(left - 5, top - 5, BOXSIZE + 10, BOXSIZE + 10)
+    DISPLAYSURF.fill(bgColor, area)
+    if coverage < BOXSIZE:
         shape, color = getShapeAndColor(board, box[0], box[1])
         drawIcon(shape, color, box[0], box[1])
-        if coverage > 0: # only draw the cover if there is an coverage
-            pygame.draw.rect(DISPLAYSURF, BOXCOLOR, (left, top, coverage, BOXSIZE))
-    pygame.display.update()
-    FPSCLOCK.tick(FPS)
+    if coverage > 0: # only draw the cover if there is an coverage
+        pygame.draw.rect(DISPLAYSURF, BOXCOLOR, (left, top, coverage, BOXSIZE))
+    if frame == HINT:
+        pygame.draw.rect(DISPLAYSURF, HINTCOLOR, area, 5)
+    elif frame == HIGHLIGHT:
+        pygame.draw.rect(DISPLAYSURF, HIGHLIGHTCOLOR, area, 4)
+    return area
 
 
-def revealBoxesAnimation(board, boxesToReveal):
+def revealBoxesAnimation(boxesToReveal, start):
     # Do the "box reveal" animation.
-    for coverage in range(BOXSIZE, (-REVEALSPEED) - 1, -REVEALSPEED):
-        drawBoxCovers(board, boxesToReveal, coverage)
+    return animate(REVEAL, boxesToReveal, start, REVEALTIME)
 
 
-def coverBoxesAnimation(board, boxesToCover):
+def coverBoxesAnimation(boxesToCover, start):
     # Do the "box cover" animation.
-    for coverage in range(0, BOXSIZE + REVEALSPEED, REVEALSPEED):
-        drawBoxCovers(board, boxesToCover, coverage)
-
-
-def drawBoard(board, revealed):
-    # Draws all of the boxes in their covered or revealed state.
-    for boxx in range(BOARDWIDTH):
-        for boxy in range(BOARDHEIGHT):
-            left, top = leftTopCoordsOfBox(boxx, boxy)
-            if not revealed[boxx][boxy]:
-                # Draw a covered box.
-                pygame.draw.rect(DISPLAYSURF, BOXCOLOR, (left, top, BOXSIZE, BOXSIZE))
-            else:
-                # Draw the (revealed) icon.
-                shape, color = getShapeAndColor(board, boxx, boxy)
-                drawIcon(shape, color, boxx, boxy)
-
-
-def drawHighlightBox(boxx, boxy):
-    left, top = leftTopCoordsOfBox(boxx, boxy)
-    pygame.draw.rect(DISPLAYSURF, HIGHLIGHTCOLOR, (left - 5, top - 5, BOXSIZE + 10, BOXSIZE + 10), 4)
-
-
-def startGameAnimation(board):
+    return animate(COVER, boxesToCover, start, REVEALTIME)
+
+
+def drawBoard(board, looks, bgColor):
+    # Draws all of the boxes as they look, on a window just filled with
+    # bgColor. The ones fully revealed or covered, without a frame, are
+    # blitted from the icon atlas in one go.
+    iconBlits = []
+    for box, look in looks.items():
+        if look == (0, None):
+            shape, color = getShapeAndColor(board, box[0], box[1])
+            iconBlits.append((ICONATLAS, leftTopCoordsOfBox(box[0], box[1]), ICONRECTS[(shape, color)]))
+        elif look == (BOXSIZE, None):
+            iconBlits.append((ICONATLAS, leftTopCoordsOfBox(box[0], box[1]), COVERRECT))
+        else:
+            drawBox(board, box, look, bgColor)
+    DISPLAYSURF.blits(iconBlits, doreturn=False)
+
+
+def startGameAnimation(start):
     # Randomly reveal the boxes 8 at a time.
-    coveredBoxes = generateRevealedBoxesData(False)
     boxes = []
     for x in range(BOARDWIDTH):
         for y in range(BOARDHEIGHT):
@@ -338,26 +474,15 @@ def startGameAnimation(board):
     random.shuffle(boxes)
     boxGroups = splitIntoGroupsOf(8, boxes)
 
-    drawBoard(board, coveredBoxes)
     for boxGroup in boxGroups:
-        revealBoxesAnimation(board, boxGroup)
-        coverBoxesAnimation(board, boxGroup)
-
-
+        start = revealBoxesAnimation(boxGroup, start)
+        start = coverBoxesAnimation(boxGroup, start)
+    return start
 
 
-def gameWonAnimation(board):
+def gameWonAnimation(start):
     # flash the background color when the player has won
-    coveredBoxes = generateRevealedBoxesData(True)
-    color1 = LIGHTBGCOLOR
-    color2 = BGCOLOR
-
-    for i in range(13):
-        color1, color2 = color2, color1 # swap colors
-        DISPLAYSURF.fill(color1)
-        drawBoard(board, coveredBoxes)
-        pygame.display.update()
-        pygame.time.wait(300)
+    return animate(FLASH, [], start, 13 * FLASHTIME)
 
 
 def hasWon(revealedBoxes):
@@ -0,0 +1,97 @@
+# Checks memorypuzzle.py's shortcuts against the slow code they replaced:
+#
+#   python memorypuzzlecheck.py
+#
+# getBoxAtPixel() divides by the grid's cell size instead of testing every
+# box's rect, so it has to pick the same box as the rects on every pixel.
+# Icons are blitted from an atlas instead of drawn, so each one has to come
+# out the same as drawing it; a revealed board is timed both ways.
+
+import random
+import time
+
+import pygame
+
+import memorypuzzle
+from memorypuzzle import (BOARDWIDTH, BOARDHEIGHT, BOXSIZE, GAPSIZE, XMARGIN, YMARGIN,
+                          WINDOWWIDTH, WINDOWHEIGHT, BGCOLOR, LIGHTBGCOLOR, ICONRECTS,
+                          getBoxAtPixel, leftTopCoordsOfBox, drawIcon, drawIconShape,
+                          drawBoard, getRandomizedBoard, getShapeAndColor)
+
+
+def getBoxAtPixelByRects(x, y):
+    # memorypuzzle's old getBoxAtPixel()
+    for boxx in range(BOARDWIDTH):
+        for boxy in range(BOARDHEIGHT):
+            left, top = leftTopCoordsOfBox(boxx, boxy)
+            boxRect = pygame.Rect(left, top, BOXSIZE, BOXSIZE)
+            if boxRect.collidepoint(x, y):
+                return (boxx, boxy)
+    return (None, None)
+
+
+def checkGetBoxAtPixel():
+    # every pixel of each box edge row and column (and the ones either side
+    # of it) across the whole window, and random pixels
+    edges = set()
+    for i in range(max(BOARDWIDTH, BOARDHEIGHT) + 1):
+        for margin in (XMARGIN, YMARGIN):
+            left = i * (BOXSIZE + GAPSIZE) + margin
+            for edge in (left, left + BOXSIZE):
+                edges.update((edge - 1, edge))
+    pixels = []
+    for edge in edges:
+        for i in range(-10, max(WINDOWWIDTH, WINDOWHEIGHT) + 10):
+            pixels.append((edge, i))
+            pixels.append((i, edge))
+    for i in range(10000):
+        pixels.append((random.randint(-10, WINDOWWIDTH + 10), random.randint(-10, WINDOWHEIGHT + 10)))
+
+    for x, y in pixels:
+        assert getBoxAtPixel(x, y) == getBoxAtPixelByRects(x, y), 'getBoxAtPixel(%s, %s) is wrong' % (x, y)
+        assert getBoxAtPixel(x, y) == getBoxAtPixelByRects(x, y), 'getBoxAtPixel(%s, %s) is wrong when cached' % (x, y)
+    print('getBoxAtPixel matches on %s pixels' % len(pixels))
+
+
+def drawShapes(board):
+    # memorypuzzle's old way of drawing a revealed board
+    for boxx in range(BOARDWIDTH):
+        for boxy in range(BOARDHEIGHT):
+            shape, color = getShapeAndColor(board, boxx, boxy)
+            left, top = leftTopCoordsOfBox(boxx, boxy)
+            drawIconShape(memorypuzzle.DISPLAYSURF, shape, color, left, top)
+
+
+def checkIconAtlas():
+    # every icon on both background colors
+    pygame.init()
+    DISPLAYSURF = memorypuzzle.DISPLAYSURF = pygame.display.set_mode((WINDOWWIDTH, WINDOWHEIGHT))
+    memorypuzzle.ICONATLAS = memorypuzzle.makeIconAtlas()
+    drawn = pygame.Surface((BOXSIZE, BOXSIZE)).convert()
+    for bgColor in (BGCOLOR, LIGHTBGCOLOR):
+        for shape, color in ICONRECTS:
+            DISPLAYSURF.fill(bgColor)
+            drawIcon(shape, color, 0, 0)
+            drawn.fill(bgColor)
+            drawIconShape(drawn, shape, color, 0, 0)
+            left, top = leftTopCoordsOfBox(0, 0)
+            blitted = DISPLAYSURF.subsurface((left, top, BOXSIZE, BOXSIZE))
+            assert pygame.image.tobytes(blitted, 'RGB') == pygame.image.tobytes(drawn, 'RGB'), 'the %s %s icon is wrong' % (color, shape)
+    print('icon atlas matches on %s icons' % len(ICONRECTS))
+
+    # a fully revealed board, drawn shape by shape and from the atlas
+    board = getRandomizedBoard()
+    looks = {}
+    for boxx in range(BOARDWIDTH):
+        for boxy in range(BOARDHEIGHT):
+            looks[(boxx, boxy)] = (0, None)
+    for name, drawRevealed in (('shapes', lambda: drawShapes(board)), ('atlas', lambda: drawBoard(board, looks, BGCOLOR))):
+        start = time.perf_counter()
+        for i in range(200):
+            drawRevealed()
+        print('revealed board from the %s: %.0f us' % (name, (time.perf_counter() - start) / 200 * 1e6))
+
+
+if __name__ == '__main__':
+    checkGetBoxAtPixel()
+    checkIconAtlas()
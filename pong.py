@@ -1,12 +1,20 @@
-import pygame
+import os
 import random
 import sys
+import time
+
+import pygame
+
+import pongai
+import pongphysics
+import pongreplay
+import textcache
 
 pygame.init()
 
 # Window
-WIDTH = 900
-HEIGHT = 600
+WIDTH = pongphysics.WIDTH
+HEIGHT = pongphysics.HEIGHT
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Pong Game")
 
@@ -19,137 +27,172 @@ RED = (220, 0, 0)
 GRAY = (230, 230, 230)
 
 # Paddle
-paddle_width = 20
-paddle_height = 120
-paddle_x = 30
-paddle_y = HEIGHT // 2 - paddle_height // 2
-paddle_speed = 7
+paddle_width = pongphysics.PADDLE_WIDTH
+paddle_height = pongphysics.PADDLE_HEIGHT
+paddle_x = pongphysics.PADDLE_X
 
 # Ball
-ball_size = 20
-ball_x = WIDTH // 2
-ball_y = HEIGHT // 2
-ball_speed_x = 5
-ball_speed_y = 5
-
-score = 0
-game_over = False
-paused = False
-
-font_score = pygame.font.SysFont("arial", 32, bold=True)
-font_big = pygame.font.SysFont("arial", 50, bold=True)
-button_font = pygame.font.SysFont("arial", 22, bold=True)
+ball_size = pongphysics.BALL_SIZE
+
+# --replay FILE: watch a recorded session instead of playing one
+replay = None
+if "--replay" in sys.argv:
+    replay = pongreplay.load(sys.argv[sys.argv.index("--replay") + 1])
+
+# every session is recorded (its seed and the inputs of each frame) and
+# saved to replays/ on quit
+seed = replay["seed"] if replay else random.getrandbits(64)
+game = pongphysics.new_game(seed)
+recording = pongreplay.new_recording(seed)
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replays")
+
+# --ai [reaction error in px]: the computer plays, and restarts after a miss
+ai = None
+if "--ai" in sys.argv:
+    args = sys.argv[sys.argv.index("--ai") + 1:]
+    ai = pongai.new_ai(float(args[0]) if args and args[0].replace(".", "", 1).isdigit() else 0)
+
+font_score = textcache.font(32, "arial", bold=True, system=True)
+font_big = textcache.font(50, "arial", bold=True, system=True)
+button_font = textcache.font(22, "arial", bold=True, system=True)
 
 # PAUSE button (moved to the right)
 pause_button = pygame.Rect(WIDTH - 300, 20, 100, 40)
 
-def draw_buttons():
-    pygame.draw.rect(screen, GRAY, pause_button, border_radius=7)
-    pygame.draw.rect(screen, BLACK, pause_button, 2, border_radius=7)
-    text_p = button_font.render("PAUSE", True, RED)
-    screen.blit(text_p, (pause_button.x + 20, pause_button.y + 8))
-
-
-def reset_game():
-    global ball_x, ball_y, ball_speed_x, ball_speed_y, score, game_over
-    ball_x = WIDTH // 2
-    ball_y = HEIGHT // 2
-    ball_speed_x = 5
-    ball_speed_y = 5
-    score = 0
-    game_over = False
+def draw_buttons(surface):
+    pygame.draw.rect(surface, GRAY, pause_button, border_radius=7)
+    pygame.draw.rect(surface, BLACK, pause_button, 2, border_radius=7)
+    text_p = textcache.render("PAUSE", button_font, RED)
+    surface.blit(text_p, (pause_button.x + 20, pause_button.y + 8))
+
+
+# ---------------- HUD ----------------
+# Everything that does not move is drawn once into the background. Each
+# frame only the regions whose contents changed are redrawn, back to front
+# from the background up, in one blits() call, and only those regions are
+# sent to the display: the ball's and the paddle's old and new rects, and
+# the score or a message when it changes.
+background = pygame.Surface((WIDTH, HEIGHT)).convert()
+background.fill(BLACK)
+draw_buttons(background)
+
+paddle_image = pygame.Surface((paddle_width, paddle_height)).convert()
+paddle_image.fill(WHITE)
+ball_image = pygame.Surface((ball_size, ball_size)).convert()
+ball_image.fill(WHITE)
+
+over_text = textcache.render("GAME OVER", font_big, RED)
+retry_text = textcache.render("Press R to restart", font_score, WHITE)
+pause_text = textcache.render("PAUSED", font_big, RED)
+
+LAYERS = ("paddle", "ball", "score", "over", "retry", "paused")  # back to front
+hud = {"score": None, "score_text": None, "shown": None}
+
+
+def hud_items(game):
+    # name -> (image, rect) of everything drawn over the background
+    ball_x, ball_y = game["ball"][:2]
+    score = game["score"]
+    if score != hud["score"]:
+        hud["score"] = score
+        hud["score_text"] = textcache.render(f"Score: {score}", font_score, WHITE)
+    items = {
+        "paddle": (paddle_image, pygame.Rect(paddle_x, game["paddle_y"], paddle_width, paddle_height)),
+        "ball": (ball_image, pygame.Rect(ball_x, ball_y, ball_size, ball_size)),
+        "score": (hud["score_text"], hud["score_text"].get_rect(topleft=(WIDTH - 150, 20))),
+    }
+    if game["game_over"]:
+        items["over"] = (over_text, over_text.get_rect(topleft=(WIDTH // 2 - 160, HEIGHT // 2 - 50)))
+        items["retry"] = (retry_text, retry_text.get_rect(topleft=(WIDTH // 2 - 150, HEIGHT // 2 + 20)))
+    elif game["paused"]:
+        items["paused"] = (pause_text, pause_text.get_rect(topleft=(WIDTH // 2 - 110, HEIGHT // 2 - 40)))
+    return items
+
+
+def draw_hud(items):
+    # redraws what changed since the last call; returns the dirty rects
+    shown = hud["shown"]
+    if shown is None:
+        dirty = [screen.get_rect()]
+    else:
+        dirty = []
+        for name in LAYERS:
+            old, new = shown.get(name), items.get(name)
+            if old != new:
+                if old:
+                    dirty.append(old[1])
+                if new:
+                    dirty.append(new[1])
+        dirty = [rect.clip(screen.get_rect()) for rect in dirty]
+        dirty = [rect for rect in dirty if rect]
+
+    blits = []
+    for rect in dirty:
+        blits.append((background, rect, rect))
+        for name in LAYERS:
+            if name in items:
+                image, at = items[name]
+                part = at.clip(rect)
+                if part:
+                    blits.append((image, part, part.move(-at.x, -at.y)))
+    screen.blits(blits, doreturn=False)
+    hud["shown"] = items
+    return dirty
+
+
+def save_replay():
+    if replay or not recording["frames"]:
+        return
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    name = time.strftime("pong-%Y%m%d-%H%M%S.replay")
+    pongreplay.save(recording, game, os.path.join(REPLAY_DIR, name))
 
 
 # ---------------- GAME LOOP ----------------
 while True:
+    bits = 0
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            save_replay()
             sys.exit()
 
         # Mouse support for PAUSE
         if event.type == pygame.MOUSEBUTTONDOWN:
             if pause_button.collidepoint(event.pos):
-                paused = not paused
+                bits ^= pongphysics.PAUSE
 
         # Keyboard support
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_p:  # Pause
-                paused = not paused
+                bits ^= pongphysics.PAUSE
 
             if event.key == pygame.K_r:  # Reset after game over
-                if game_over:
-                    reset_game()
+                bits |= pongphysics.RESTART
 
     keys = pygame.key.get_pressed()
-
-    # Paddle movement
-    if not game_over and not paused:
-        if keys[pygame.K_UP] and paddle_y > 0:
-            paddle_y -= paddle_speed
-        if keys[pygame.K_DOWN] and paddle_y < HEIGHT - paddle_height:
-            paddle_y += paddle_speed
-
-        # Move ball
-        ball_x += ball_speed_x
-        ball_y += ball_speed_y
-
-        # Top/bottom collision
-        if ball_y <= 0 or ball_y >= HEIGHT - ball_size:
-            ball_speed_y *= -1
-
-        # Right wall = bounce
-        if ball_x >= WIDTH - ball_size:
-            ball_speed_x *= -1
-
-        # Paddle collision
-        paddle_rect = pygame.Rect(paddle_x, paddle_y, paddle_width, paddle_height)
-        ball_rect = pygame.Rect(ball_x, ball_y, ball_size, ball_size)
-
-        if ball_rect.colliderect(paddle_rect):
-            ball_speed_x *= -1
-
-            # random Y change
-            ball_speed_y += random.randint(-3, 3)
-
-            # increase speed
-            if ball_speed_x > 0:
-                ball_speed_x += 1
-            else:
-                ball_speed_x -= 1
-
-            score += 1
-
-        # MISS → GAME OVER
-        if ball_x < -ball_size:
-            game_over = True
+    if keys[pygame.K_UP]:
+        bits |= pongphysics.UP
+    if keys[pygame.K_DOWN]:
+        bits |= pongphysics.DOWN
+
+    if replay:
+        bits = replay["inputs"][game["frame"]] if game["frame"] < replay["frames"] else None
+    elif ai:
+        bits &= pongphysics.PAUSE
+        if game["game_over"]:
+            bits |= pongphysics.RESTART
+            pongai.reset(ai)
+        elif not game["paused"]:
+            move = pongai.action(ai, game["ball"], game["paddle_y"])
+            bits |= pongphysics.UP if move < 0 else pongphysics.DOWN if move > 0 else 0
+
+    # Paddle movement, then the ball: it bounces off the walls and the paddle
+    # at the exact time of impact, so a fast ball can not skip through the
+    # paddle. A paddle hit sends it back faster, with a random Y change
+    if bits is not None:  # None once a replay has ended
+        pongphysics.frame(game, bits)
+        pongreplay.record(recording, bits)
 
     # DRAW
-    screen.fill(BLACK)
-
-    draw_buttons()
-
-    # Paddle
-    pygame.draw.rect(screen, WHITE, (paddle_x, paddle_y, paddle_width, paddle_height))
-
-    # Ball
-    pygame.draw.rect(screen, WHITE, (ball_x, ball_y, ball_size, ball_size))
-
-    # Score
-    score_text = font_score.render(f"Score: {score}", True, WHITE)
-    screen.blit(score_text, (WIDTH - 150, 20))
-
-    # GAME OVER
-    if game_over:
-        over_text = font_big.render("GAME OVER", True, RED)
-        screen.blit(over_text, (WIDTH // 2 - 160, HEIGHT // 2 - 50))
-
-        retry_text = font_score.render("Press R to restart", True, WHITE)
-        screen.blit(retry_text, (WIDTH // 2 - 150, HEIGHT // 2 + 20))
-
-    # PAUSED
-    if paused and not game_over:
-        pause_text = font_big.render("PAUSED", True, RED)
-        screen.blit(pause_text, (WIDTH // 2 - 110, HEIGHT // 2 - 40))
-
-    pygame.display.flip()
+    pygame.display.update(draw_hud(hud_items(game)))
     clock.tick(60)
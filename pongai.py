@@ -0,0 +1,127 @@
+# Computer paddle for pong.py. Where the ball will reach the paddle is worked
+# out in closed form: the right-wall bounce only adds distance in x, and the
+# top/bottom bounces are unfolded, so y is the straight-line y folded back
+# into the field. That costs the same at any ball speed, and it is only
+# redone when the ball's speed changes (a paddle hit or a new serve), not on
+# wall bounces, which the unfolding already accounts for. reaction_error
+# adds a random miss-aim of up to that many pixels to each prediction.
+#
+#   python pongai.py [predictions]   # predictions per second, and a soak
+#                                    # test of the AI on the pongenv batch
+
+import random
+import sys
+import time
+
+import numpy as np
+
+import pongenv
+
+WIDTH, HEIGHT = pongenv.WIDTH, pongenv.HEIGHT
+BALL_SIZE = pongenv.BALL_SIZE
+PADDLE_FACE = pongenv.PADDLE_X + pongenv.PADDLE_WIDTH  # x of the ball's left edge when it reaches the paddle
+PADDLE_HEIGHT = pongenv.PADDLE_HEIGHT
+DEADZONE = pongenv.PADDLE_SPEED / 2
+
+
+def predict_y(x, y, vx, vy):
+    # ball y when its left edge comes back to PADDLE_FACE
+    if vx > 0:
+        distance = (WIDTH - BALL_SIZE - x) + (WIDTH - BALL_SIZE - PADDLE_FACE)
+    else:
+        distance = x - PADDLE_FACE
+    y += vy * distance / abs(vx)
+
+    span = HEIGHT - BALL_SIZE
+    y %= 2 * span
+    return y if y <= span else 2 * span - y
+
+
+def new_ai(reaction_error=0, seed=None):
+    return {"error": reaction_error, "rng": random.Random(seed), "speed": None, "target": None}
+
+
+def action(ai, ball, paddle_y):
+    # pongenv.UP / STAY / DOWN for the paddle at paddle_y
+    x, y, vx, vy = ball
+    speed = (abs(vx), abs(vy))
+    if speed != ai["speed"] or ai["target"] is None:
+        ai["speed"] = speed
+        miss = ai["rng"].uniform(-ai["error"], ai["error"]) if ai["error"] else 0
+        ai["target"] = predict_y(x, y, vx, vy) + BALL_SIZE / 2 + miss
+
+    offset = ai["target"] - (paddle_y + PADDLE_HEIGHT / 2)
+    if offset < -DEADZONE:
+        return pongenv.UP
+    if offset > DEADZONE:
+        return pongenv.DOWN
+    return pongenv.STAY
+
+
+def reset(ai):
+    # after a serve from the middle; the ball may come back at a speed already seen
+    ai["speed"] = ai["target"] = None
+
+
+def batch_predict_y(x, y, vx, vy):
+    # predict_y over arrays
+    distance = np.where(vx > 0, 2 * (WIDTH - BALL_SIZE) - x - PADDLE_FACE, x - PADDLE_FACE)
+    y = y + vy * distance / np.abs(vx)
+    span = HEIGHT - BALL_SIZE
+    y = np.mod(y, 2 * span)
+    return np.where(y <= span, y, 2 * span - y)
+
+
+def new_batch_ai(n, reaction_error=0, seed=None):
+    # action() for every game of a pongenv batch
+    return {"error": reaction_error, "rng": np.random.default_rng(seed),
+            "speed": np.full((2, n), np.nan), "target": np.zeros(n)}
+
+
+def batch_action(ai, batch):
+    x, y, vx, vy = batch["x"], batch["y"], batch["vx"], batch["vy"]
+    speed = np.abs(np.stack((vx, vy)))
+    changed = (speed != ai["speed"]).any(axis=0) | batch["done"]
+    if changed.any():
+        ai["speed"][:, changed] = speed[:, changed]
+        target = batch_predict_y(x[changed], y[changed], vx[changed], vy[changed]) + BALL_SIZE / 2
+        if ai["error"]:
+            target += ai["rng"].uniform(-ai["error"], ai["error"], len(target))
+        ai["target"][changed] = target
+
+    offset = ai["target"] - (batch["paddle_y"] + PADDLE_HEIGHT / 2)
+    return np.where(offset < -DEADZONE, pongenv.UP, np.where(offset > DEADZONE, pongenv.DOWN, pongenv.STAY))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(0)
+    balls = [(rng.uniform(PADDLE_FACE, WIDTH - BALL_SIZE), rng.uniform(0, HEIGHT - BALL_SIZE),
+              rng.choice((-1, 1)) * rng.uniform(5, 500), rng.uniform(-500, 500)) for _ in range(10000)]
+
+    start = time.perf_counter()
+    for i in range(n):
+        predict_y(*balls[i % len(balls)])
+    elapsed = time.perf_counter() - start
+    print(f"predict_y: {n / elapsed / 1e6:.2f}M predictions/s")
+
+    batch = pongenv.new_batch(100000, seed=0)
+    start = time.perf_counter()
+    for _ in range(20):
+        batch_predict_y(batch["x"], batch["y"], batch["vx"], batch["vy"])
+    elapsed = time.perf_counter() - start
+    print(f"batch_predict_y: {20 * batch['n'] / elapsed / 1e6:.2f}M predictions/s")
+
+    # soak test: without reaction error the AI should only miss once the ball
+    # is faster than the paddle can follow
+    frames = 3000
+    for error in (0, 40, 80):
+        batch = pongenv.new_batch(10000, seed=1)
+        ai = new_batch_ai(batch["n"], error, seed=1)
+        start = time.perf_counter()
+        for _ in range(frames):
+            pongenv.step(batch, batch_action(ai, batch))
+        elapsed = time.perf_counter() - start
+        print(f"reaction error {error:>2}px: {batch['episodes']} misses in {batch['n'] * frames} frames, "
+              f"best rally {int(max(batch['score'].max(), batch['last_score'].max()))}, "
+              f"{batch['n'] * frames / elapsed / 1e6:.2f}M frames/s")
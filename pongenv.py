@@ -0,0 +1,197 @@
+# Headless batch of Pong games for training and evaluating paddle policies.
+# N games live in NumPy arrays and step() advances all of them with one
+# vectorised update: the paddle move from pong.py, then the same swept ball
+# movement as pongphysics.step() (walls, paddle hits that speed the ball up
+# and kick vy by a random -3..3). A missed ball ends the game, which resets
+# on its own in the same step.
+#
+#   python pongenv.py [games] [steps]   # steps per second, and a check
+#                                       # against pongphysics
+
+import sys
+import time
+
+import numpy as np
+
+import pongphysics
+
+WIDTH, HEIGHT = pongphysics.WIDTH, pongphysics.HEIGHT
+BALL_SIZE = pongphysics.BALL_SIZE
+PADDLE_X, PADDLE_WIDTH, PADDLE_HEIGHT = pongphysics.PADDLE_X, pongphysics.PADDLE_WIDTH, pongphysics.PADDLE_HEIGHT
+PADDLE_SPEED = pongphysics.PADDLE_SPEED
+
+KICK = 3
+
+# actions
+UP, STAY, DOWN = -1, 0, 1
+
+
+def new_batch(n, seed=None, kick=KICK):
+    batch = {
+        "n": n,
+        "x": np.zeros(n),
+        "y": np.zeros(n),
+        "vx": np.zeros(n),
+        "vy": np.zeros(n),
+        "paddle_y": np.full(n, float(HEIGHT // 2 - PADDLE_HEIGHT // 2)),
+        "score": np.zeros(n, dtype=np.int32),
+        "done": np.zeros(n, dtype=bool),  # which games ended (and were reset) in the last step
+        "last_score": np.zeros(n, dtype=np.int32),  # score of each game's last finished round
+        "episodes": 0,
+        "rng": np.random.default_rng(seed),
+        "kick": kick,
+    }
+    reset(batch, np.ones(n, dtype=bool))
+    return batch
+
+
+def reset(batch, mask):
+    # the ball back in the middle, as pongphysics.serve(); the paddle stays
+    batch["x"][mask], batch["y"][mask], batch["vx"][mask], batch["vy"][mask] = pongphysics.SERVE
+    batch["score"][mask] = 0
+
+
+def move_paddles(batch, actions):
+    # pong.py moves 7px while the paddle is not yet past the edge
+    y = batch["paddle_y"]
+    up = (actions < 0) & (y > 0)
+    down = (actions > 0) & (y < HEIGHT - PADDLE_HEIGHT)
+    y[up] -= PADDLE_SPEED
+    y[down] += PADDLE_SPEED
+
+
+def _paddle_impact(x, y, vx, vy, paddle_y, t_max):
+    # pongphysics.paddle_impact for every game: impact time, and where there is one
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lo_x, hi_x = PADDLE_X - BALL_SIZE, PADDLE_X + PADDLE_WIDTH
+        enter = (hi_x - x) / vx  # vx < 0 wherever this is used
+        leave = (lo_x - x) / vx
+
+        lo_y, hi_y = paddle_y - BALL_SIZE, paddle_y + PADDLE_HEIGHT
+        still = vy == 0
+        enter_y = np.where(vy > 0, (lo_y - y) / vy, (hi_y - y) / vy)
+        leave_y = np.where(vy > 0, (hi_y - y) / vy, (lo_y - y) / vy)
+        inside = (lo_y < y) & (y < hi_y)
+        enter_y[still] = -np.inf
+        leave_y[still] = np.where(inside[still], np.inf, -np.inf)
+
+    enter = np.maximum(enter, enter_y)
+    leave = np.minimum(leave, leave_y)
+    hit = (vx < 0) & (enter < leave) & (leave > 0) & (enter <= t_max)
+    return np.maximum(enter, 0.0), hit
+
+
+def move_balls(batch, dt=1.0):
+    # returns the number of paddle hits per game
+    x, y, vx, vy = batch["x"], batch["y"], batch["vx"], batch["vy"]
+    hits = np.zeros(batch["n"], dtype=np.int32)
+    left = np.full(batch["n"], dt)
+    active = np.ones(batch["n"], dtype=bool)
+
+    for _ in range(pongphysics.MAX_BOUNCES):
+        # earliest impact within what is left of the step, as in pongphysics.step
+        t = left.copy()
+        wall = np.zeros(batch["n"], dtype=np.int8)  # 0 none, 1 top/bottom, 2 right, 3 paddle
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ty = np.where(vy < 0, -y / vy, (HEIGHT - BALL_SIZE - y) / vy)
+            tx = (WIDTH - BALL_SIZE - x) / vx
+        m = (vy != 0) & (ty < t)
+        t[m], wall[m] = np.maximum(ty[m], 0.0), 1
+        m = (vx > 0) & (tx < t)
+        t[m], wall[m] = np.maximum(tx[m], 0.0), 2
+        th, m = _paddle_impact(x, y, vx, vy, batch["paddle_y"], t)
+        t[m], wall[m] = th[m], 3
+
+        active &= wall != 0
+        if not active.any():
+            break
+        t[~active] = 0.0
+        wall[~active] = 0
+        x += vx * t
+        y += vy * t
+        left -= t
+
+        m = wall == 1
+        vy[m] = -vy[m]
+        m = wall == 2
+        vx[m] = -vx[m]
+        m = wall == 3
+        vx[m] = np.abs(vx[m]) + 1
+        vy[m] += batch["rng"].integers(-batch["kick"], batch["kick"] + 1, int(m.sum()))
+        hits[m] += 1
+
+    x += vx * left
+    y += vy * left
+    return hits
+
+
+def step(batch, actions, dt=1.0):
+    # one frame of every game: actions is an array of UP / STAY / DOWN.
+    # Returns the paddle hits per game; batch["done"] marks the games that
+    # missed, which are already reset
+    move_paddles(batch, actions)
+    hits = move_balls(batch, dt)
+    batch["score"] += hits
+
+    done = batch["x"] < -BALL_SIZE
+    batch["done"] = done
+    if done.any():
+        batch["last_score"][done] = batch["score"][done]
+        batch["episodes"] += int(done.sum())
+        reset(batch, done)
+    return hits
+
+
+def track_ball(batch):
+    # a simple policy: move towards the ball's centre
+    return np.sign((batch["y"] + BALL_SIZE / 2) - (batch["paddle_y"] + PADDLE_HEIGHT / 2)).astype(np.int8)
+
+
+# ---------------- CHECK / BENCH ----------------
+class _NoKick:
+    def randint(self, a, b):
+        return 0
+
+
+def check(games=64, steps=3000, seed=0):
+    # without the random kick, every game must follow pongphysics.step exactly
+    batch = new_batch(games, seed, kick=0)
+    rng = np.random.default_rng(seed)
+    batch["vy"][:] = rng.uniform(-40, 40, games)
+    batch["vx"][:] = -rng.uniform(5, 60, games)
+    balls = list(zip(batch["x"].tolist(), batch["y"].tolist(), batch["vx"].tolist(), batch["vy"].tolist()))
+    paddles = batch["paddle_y"].tolist()
+    scores = [0] * games
+
+    for _ in range(steps):
+        actions = rng.integers(-1, 2, games)
+        step(batch, actions)
+        for i in range(games):
+            if actions[i] < 0 and paddles[i] > 0:
+                paddles[i] -= PADDLE_SPEED
+            elif actions[i] > 0 and paddles[i] < HEIGHT - PADDLE_HEIGHT:
+                paddles[i] += PADDLE_SPEED
+            paddle = (PADDLE_X, paddles[i], PADDLE_WIDTH, PADDLE_HEIGHT)
+            balls[i], hits = pongphysics.step(balls[i], paddle, (WIDTH, HEIGHT, BALL_SIZE), rng=_NoKick())
+            scores[i] += hits
+            if balls[i][0] < -BALL_SIZE:
+                balls[i], scores[i] = pongphysics.SERVE, 0
+
+        expected = np.array(balls)
+        got = np.stack([batch["x"], batch["y"], batch["vx"], batch["vy"]], axis=1)
+        assert np.allclose(got, expected, atol=1e-6), "batch and pongphysics disagree"
+        assert batch["score"].tolist() == scores
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    check()
+    batch = new_batch(games, seed=0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        step(batch, track_ball(batch))
+    elapsed = time.perf_counter() - start
+    print(f"{games} games x {steps} steps in {elapsed:.2f}s: {games * steps / elapsed / 1e6:.2f}M steps/s, "
+          f"{batch['episodes']} games over")
@@ -0,0 +1,143 @@
+# Swept ball movement for pong.py. Instead of moving the ball a whole frame
+# and then testing for overlap, step() finds the exact time of impact with
+# the walls and the paddle within the step, bounces there and carries on
+# with what is left of the step. A fast ball can not tunnel through the
+# paddle or overshoot a wall, however large the speed or the timestep.
+#
+# The ball is (x, y, vx, vy): its top-left corner and its speed in px per
+# 60 FPS frame. The field is (width, height, ball_size); the left side is
+# open, that is where the ball is missed.
+#
+# new_game() / frame() are pong.py's rules for one whole frame, driven only
+# by that frame's input bits and the game's own seeded RNG, so a session can
+# be replayed from its seed and inputs (see pongreplay.py).
+
+import random
+
+MAX_BOUNCES = 32  # per step, only reached by a ball stuck in a corner
+
+# pong.py's field, paddle and serve
+WIDTH, HEIGHT = 900, 600
+BALL_SIZE = 20
+PADDLE_X, PADDLE_WIDTH, PADDLE_HEIGHT = 30, 20, 120
+PADDLE_SPEED = 7
+SERVE = (WIDTH // 2, HEIGHT // 2, 5, 5)
+
+# input bits of one frame; PAUSE and RESTART are key presses, not held keys
+UP, DOWN, PAUSE, RESTART = 1, 2, 4, 8
+
+
+def paddle_impact(ball, size, paddle, t_max):
+    # time in [0, t_max] when the ball's box first overlaps the paddle, or
+    # None. Touching edges do not count, as with Rect.colliderect. Only a
+    # ball heading left can hit; one the paddle moved onto counts at t=0
+    x, y, vx, vy = ball
+    if vx >= 0:
+        return None
+    px, py, pw, ph = paddle
+    t_enter, t_exit = float("-inf"), float("inf")
+    # the ball's corner against the paddle grown by the ball's size
+    for p, v, lo, hi in ((x, vx, px - size, px + pw), (y, vy, py - size, py + ph)):
+        if v == 0:
+            if not lo < p < hi:
+                return None
+            continue
+        t0, t1 = (lo - p) / v, (hi - p) / v
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_enter, t_exit = max(t_enter, t0), min(t_exit, t1)
+
+    if t_enter >= t_exit or t_exit <= 0 or t_enter > t_max:
+        return None
+    return max(t_enter, 0.0)
+
+
+def step(ball, paddle, field, dt=1.0, rng=random):
+    # moves the ball dt frames, bouncing off the walls and the paddle. Every
+    # paddle hit sends the ball right, 1 px/frame faster and with a random
+    # change in vy. Returns the new ball and the number of paddle hits
+    x, y, vx, vy = ball
+    width, height, size = field
+    hits = 0
+    left = dt
+    for _ in range(MAX_BOUNCES):
+        # earliest impact within what is left of the step
+        t, wall = left, None
+        if vy < 0 and -y / vy < t:
+            t, wall = max(-y / vy, 0.0), "y"
+        elif vy > 0 and (height - size - y) / vy < t:
+            t, wall = max((height - size - y) / vy, 0.0), "y"
+        if vx > 0 and (width - size - x) / vx < t:
+            t, wall = max((width - size - x) / vx, 0.0), "x"
+        hit = paddle_impact((x, y, vx, vy), size, paddle, t)
+        if hit is not None:
+            t, wall = hit, "paddle"
+        if wall is None:
+            break
+
+        x, y, left = x + vx * t, y + vy * t, left - t
+        if wall == "y":
+            vy = -vy
+        elif wall == "x":
+            vx = -vx
+        else:
+            vx = abs(vx) + 1
+            vy += rng.randint(-3, 3)
+            hits += 1
+
+    return (x + vx * left, y + vy * left, vx, vy), hits
+
+
+def new_game(seed=None):
+    return {
+        "ball": SERVE,
+        "paddle_y": HEIGHT // 2 - PADDLE_HEIGHT // 2,
+        "score": 0,
+        "game_over": False,
+        "paused": False,
+        "frame": 0,
+        "rng": random.Random(seed),
+    }
+
+
+def serve(game):
+    game["ball"] = SERVE
+    game["score"] = 0
+    game["game_over"] = False
+
+
+def frame(game, bits):
+    # one frame of play from its input bits
+    if bits & PAUSE:
+        game["paused"] = not game["paused"]
+    if bits & RESTART and game["game_over"]:
+        serve(game)
+
+    if not game["game_over"] and not game["paused"]:
+        y = game["paddle_y"]
+        if bits & UP and y > 0:
+            y -= PADDLE_SPEED
+        if bits & DOWN and y < HEIGHT - PADDLE_HEIGHT:
+            y += PADDLE_SPEED
+        game["paddle_y"] = y
+
+        paddle = (PADDLE_X, y, PADDLE_WIDTH, PADDLE_HEIGHT)
+        game["ball"], hits = step(game["ball"], paddle, (WIDTH, HEIGHT, BALL_SIZE), rng=game["rng"])
+        game["score"] += hits
+        if game["ball"][0] < -BALL_SIZE:  # missed
+            game["game_over"] = True
+    game["frame"] += 1
+
+
+def snapshot(game):
+    # a copy of the game that restore() can bring back, RNG included
+    saved = dict(game)
+    saved["rng"] = game["rng"].getstate()
+    return saved
+
+
+def restore(saved):
+    game = dict(saved)
+    game["rng"] = random.Random()
+    game["rng"].setstate(saved["rng"])
+    return game
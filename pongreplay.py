@@ -0,0 +1,201 @@
+# Replays of pong.py sessions. A session is fully decided by its RNG seed
+# and its per-frame input bits (pongphysics.UP / DOWN / PAUSE / RESTART), so
+# that is all a replay file holds: the seed, then the inputs as runs of
+# (bits, frame count) with the count as a varint, then the frame count,
+# score and a checksum of the final state to check a replay against. Held
+# keys change a few times a second at most, so a minute of play is a few
+# hundred bytes.
+#
+# Playing back needs no display and runs as fast as pongphysics.frame. For
+# seeking, keyframes() plays a replay once and keeps a snapshot every
+# KEYFRAME_EVERY frames; seek() starts from the one before the frame asked for.
+#
+#   python pongreplay.py FILE...            # check replays, with timings
+#   python pongreplay.py FILE --seek FRAME  # the state at a frame
+
+import struct
+import sys
+import time
+import zlib
+
+import pongphysics
+
+MAGIC = b"PRPL"
+HEADER = struct.Struct("<4sBQ")  # magic, version, seed
+TRAILER = struct.Struct("<III")  # frames, score, state checksum
+VERSION = 1
+END = 0xFF  # follows the last run
+KEYFRAME_EVERY = 600  # 10 s at 60 FPS
+
+
+def new_recording(seed):
+    return {"seed": seed, "data": bytearray(), "bits": None, "run": 0, "frames": 0}
+
+
+def record(rec, bits):
+    if bits == rec["bits"]:
+        rec["run"] += 1
+    else:
+        _flush(rec)
+        rec["bits"], rec["run"] = bits, 1
+    rec["frames"] += 1
+
+
+def _flush(rec):
+    if rec["run"]:
+        rec["data"].append(rec["bits"])
+        _put_varint(rec["data"], rec["run"])
+
+
+def _put_varint(data, n):
+    while n >= 0x80:
+        data.append(n & 0x7F | 0x80)
+        n >>= 7
+    data.append(n)
+
+
+def _get_varint(data, i):
+    n = shift = 0
+    while True:
+        byte = data[i]
+        i += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, i
+        shift += 7
+
+
+def checksum(game):
+    x, y, vx, vy = game["ball"]
+    state = struct.pack("<4ddI??", x, y, vx, vy, game["paddle_y"], game["score"], game["game_over"], game["paused"])
+    return zlib.crc32(state)
+
+
+def to_bytes(rec, game):
+    # the replay of a recording that ended in game
+    _flush(rec)
+    rec["run"] = 0
+    return (HEADER.pack(MAGIC, VERSION, rec["seed"]) + bytes(rec["data"]) + bytes([END])
+            + TRAILER.pack(rec["frames"], game["score"], checksum(game)))
+
+
+def from_bytes(data):
+    # ValueError for anything that is not a whole replay
+    if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a pong replay")
+    magic, version, seed = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"pong replay version {version}, expected {VERSION}")
+    # the runs are read and checked against the trailer before any of them
+    # is expanded, so a damaged run length can not run away with memory
+    runs = []
+    total = 0
+    i = HEADER.size
+    try:
+        while data[i] != END:
+            bits, (run, i) = data[i], _get_varint(data, i + 1)
+            runs.append((bits, run))
+            total += run
+        frames, score, check = TRAILER.unpack_from(data, i + 1)
+    except (IndexError, struct.error):
+        raise ValueError("truncated pong replay") from None
+    if i + 1 + TRAILER.size != len(data):
+        raise ValueError(f"{len(data) - (i + 1 + TRAILER.size)} bytes after the end of the pong replay")
+    if frames != total:
+        raise ValueError(f"pong replay has {total} frames of input for {frames} frames")
+    inputs = bytearray()
+    for bits, run in runs:
+        inputs += bytes([bits]) * run
+    return {"seed": seed, "inputs": inputs, "frames": frames, "score": score, "checksum": check}
+
+
+def save(rec, game, path):
+    with open(path, "wb") as f:
+        f.write(to_bytes(rec, game))
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return from_bytes(f.read())
+
+
+def _check_frame(replay, frame):
+    if not 0 <= frame <= len(replay["inputs"]):
+        raise ValueError(f"frame {frame} is outside the replay's 0..{len(replay['inputs'])}")
+
+
+def play(replay, until=None, game=None):
+    # the game after frame `until` (default: the end), starting over or from game
+    if game is None:
+        game = pongphysics.new_game(replay["seed"])
+    inputs, frame = replay["inputs"], pongphysics.frame
+    if until is None:
+        until = len(inputs)
+    _check_frame(replay, until)
+    for i in range(game["frame"], until):
+        frame(game, inputs[i])
+    return game
+
+
+def keyframes(replay, every=KEYFRAME_EVERY):
+    game = pongphysics.new_game(replay["seed"])
+    keys = [pongphysics.snapshot(game)]
+    for stop in range(every, len(replay["inputs"]) + 1, every):
+        play(replay, stop, game)
+        keys.append(pongphysics.snapshot(game))
+    return keys
+
+
+def seek(replay, keys, frame):
+    # the game as it was after `frame` frames
+    _check_frame(replay, frame)
+    every = keys[1]["frame"] if len(keys) > 1 else KEYFRAME_EVERY
+    start = keys[min(frame // every, len(keys) - 1)]
+    return play(replay, frame, pongphysics.restore(start))
+
+
+def verify(replay):
+    game = play(replay)
+    return game["frame"] == replay["frames"] and game["score"] == replay["score"] and checksum(game) == replay["checksum"]
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--seek" in args:
+        path, frame = args[0], int(args[args.index("--seek") + 1])
+        try:
+            replay = load(path)
+            start = time.perf_counter()
+            keys = keyframes(replay)
+            indexed = time.perf_counter()
+            game = seek(replay, keys, frame)
+            done = time.perf_counter()
+        except ValueError as e:
+            sys.exit(f"{path}: {e}")
+        print(f"frame {frame}: ball {game['ball']}, paddle {game['paddle_y']}, score {game['score']}, "
+              f"game over {game['game_over']} (keyframes {(indexed - start) * 1000:.1f} ms, "
+              f"seek {(done - indexed) * 1000:.2f} ms)")
+        sys.exit()
+
+    failed = frames = size = 0
+    start = time.perf_counter()
+    for path in args:
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            replay = from_bytes(data)
+        except ValueError as e:
+            failed += 1
+            print(f"{path}: {e}")
+            continue
+        frames += replay["frames"]
+        size += len(data)
+        if not verify(replay):
+            failed += 1
+            print(f"{path}: does not replay to its recorded end")
+    elapsed = time.perf_counter() - start
+    if frames:
+        print(f"{len(args)} replays, {frames} frames ({frames / 60:.0f} s of play) in {elapsed:.2f}s: "
+              f"{frames / elapsed / 1e6:.2f}M frames/s, {size / (frames / 60):.1f} bytes per second of play, "
+              f"{failed} failed")
+    sys.exit(1 if failed else 0)
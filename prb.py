@@ -3,6 +3,8 @@ import sys
 from pygame.locals import *
 import time
 
+import textcache
+
 # --- CONFIG ---
 WINDOW_WIDTH = 900
 WINDOW_HEIGHT = 640
@@ -63,18 +65,18 @@ def draw_all(screen, fonts, state):
     # status bar (top)
     pygame.draw.rect(screen, BLACK, (0,0, WINDOW_WIDTH, STATUS_BAR))
     status_text = f"Животи: {state['lives']}    Потези: {state['moves']}"
-    status_surf = fonts['status'].render(status_text, True, WHITE)
+    status_surf = textcache.render(status_text, fonts['status'], WHITE)
     screen.blit(status_surf, (20, (STATUS_BAR - status_surf.get_height())//2))
 
     # short status message (shows for a limited time)
     if state['status_msg'] and pygame.time.get_ticks() - state['status_msg_time'] < MSG_DISPLAY_TIME:
-        msg_surf = fonts['small'].render(state['status_msg'], True, WHITE)
+        msg_surf = textcache.render(state['status_msg'], fonts['small'], WHITE)
         screen.blit(msg_surf, (300, (STATUS_BAR - msg_surf.get_height())//2))
 
     # message area (above grid, bigger text centered)
     pygame.draw.rect(screen, DARKGRAY, (0, STATUS_BAR, WINDOW_WIDTH, MESSAGE_AREA))
     if state['big_msg']:
-        big_surf = fonts['big'].render(state['big_msg'], True, WHITE)
+        big_surf = textcache.render(state['big_msg'], fonts['big'], WHITE)
         big_rect = big_surf.get_rect(center=(WINDOW_WIDTH//2, STATUS_BAR + MESSAGE_AREA//2))
         screen.blit(big_surf, big_rect)
 
@@ -149,9 +151,9 @@ def main():
 
     # fonts
     fonts = {}
-    fonts['status'] = pygame.font.SysFont(None, 28)
-    fonts['small'] = pygame.font.SysFont(None, 24)
-    fonts['big'] = pygame.font.SysFont(None, 42)
+    fonts['status'] = textcache.font(28, system=True)
+    fonts['small'] = textcache.font(24, system=True)
+    fonts['big'] = textcache.font(42, system=True)
 
     state = reset_state()
 
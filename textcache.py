@@ -0,0 +1,53 @@
+# Shared text rendering for the games in this repo. Fonts are loaded once,
+# and rendered (text, font, color) surfaces are kept in an LRU so a label
+# that does not change is rendered once instead of every frame.
+#
+# The returned surfaces are shared between callers: blit them, never draw
+# on them. stats() reports hits / misses to check the cache is doing its job.
+
+from collections import OrderedDict
+
+import pygame
+
+MAX_SURFACES = 256
+
+_fonts = {}
+_surfaces = OrderedDict()
+_stats = {"hits": 0, "misses": 0}
+
+
+def font(size, name=None, bold=False, system=False):
+    # pygame.font.Font(name, size), or pygame.font.SysFont when system is set
+    key = (name, size, bold, system)
+    if key not in _fonts:
+        if system:
+            _fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+        else:
+            _fonts[key] = pygame.font.Font(name, size)
+            _fonts[key].set_bold(bold)
+    return _fonts[key]
+
+
+def render(text, font, color, antialias=True):
+    key = (text, font, tuple(color), antialias)
+    surf = _surfaces.get(key)
+    if surf is not None:
+        _surfaces.move_to_end(key)
+        _stats["hits"] += 1
+        return surf
+
+    _stats["misses"] += 1
+    surf = font.render(text, antialias, color)
+    _surfaces[key] = surf
+    if len(_surfaces) > MAX_SURFACES:
+        _surfaces.popitem(last=False)
+    return surf
+
+
+def stats():
+    return {"hits": _stats["hits"], "misses": _stats["misses"], "cached": len(_surfaces)}
+
+
+def clear():
+    _surfaces.clear()
+    _stats["hits"] = _stats["misses"] = 0